@@ -0,0 +1,81 @@
+import numpy as np
+from game_of_life import count_live_neighbors, apply_rule, compile_rule, DEFAULT_RULE
+
+# Incremental stepping for large boards where most of the area has settled.
+# A cell can only change if something in its 3x3 neighborhood changed in the
+# previous generation, so only those cells are re-evaluated. When too much of
+# the board is active a whole-board step is cheaper and is used instead.
+
+NEIGHBOR_OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+class ActiveRegionStepper:
+    def __init__(self, board, dense_threshold=0.2, rule=DEFAULT_RULE):
+        self.height, self.width = board.shape
+        self.dense_threshold = dense_threshold
+        self.rule = rule
+        self.generation = 0
+        # one ring of dead cells keeps neighbor lookups free of bounds checks
+        self._padded = np.zeros((self.height + 2, self.width + 2), dtype=np.uint8)
+        self._padded[1:-1, 1:-1] = board == 1
+        # flat indices of the cells to re-evaluate, None means every cell
+        self._active = None
+
+    @property
+    def board(self):
+        return self._padded[1:-1, 1:-1].astype(int)
+
+    @property
+    def active_cells(self):
+        if self._active is None:
+            return self.height * self.width
+        return len(self._active)
+
+    def step(self):
+        # advances one generation and returns how many cells changed
+        if self._active is None or len(self._active) > self.dense_threshold * self.height * self.width:
+            changed = self._step_dense()
+        else:
+            changed = self._step_sparse()
+        self._active = self._neighborhoods(changed)
+        self.generation += 1
+        return len(changed)
+
+    def _step_dense(self):
+        interior = self._padded[1:-1, 1:-1]
+        live_neighbors = count_live_neighbors(interior)
+        new_interior = apply_rule(interior == 1, live_neighbors, self.rule).astype(np.uint8)
+        changed = np.flatnonzero(new_interior != interior)
+        self._padded[1:-1, 1:-1] = new_interior
+        return changed
+
+    def _step_sparse(self):
+        ys, xs = np.divmod(self._active, self.width)
+        # positions inside the padded array
+        ys += 1
+        xs += 1
+        live_neighbors = np.zeros(len(self._active), dtype=np.uint8)
+        for dy, dx in NEIGHBOR_OFFSETS:
+            if dy or dx:
+                live_neighbors += self._padded[ys + dy, xs + dx]
+        current = self._padded[ys, xs]
+        new_values = compile_rule(self.rule).take(live_neighbors + np.uint8(9) * current)
+
+        is_changed = new_values != current
+        self._padded[ys[is_changed], xs[is_changed]] = new_values[is_changed]
+        return self._active[is_changed]
+
+    def _neighborhoods(self, changed):
+        # every board cell within one step of a changed cell, as flat indices
+        if len(changed) == 0:
+            return changed
+        ys, xs = np.divmod(changed, self.width)
+        neighbor_ys = (ys[:, None] + np.array([dy for dy, _ in NEIGHBOR_OFFSETS])).ravel()
+        neighbor_xs = (xs[:, None] + np.array([dx for _, dx in NEIGHBOR_OFFSETS])).ravel()
+        on_board = (neighbor_ys >= 0) & (neighbor_ys < self.height) & (neighbor_xs >= 0) & (neighbor_xs < self.width)
+        return np.unique(neighbor_ys[on_board] * self.width + neighbor_xs[on_board])
+
+def run_active_region(board, generations, dense_threshold=0.2, rule=DEFAULT_RULE):
+    stepper = ActiveRegionStepper(board, dense_threshold, rule)
+    for _ in range(generations):
+        stepper.step()
+    return stepper.board
@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+from game_of_life import next_board_state, make_rng
+from bitboard import pack_board, next_packed_state
+from ga_solver import calculate_fitness, evolve_patterns
+
+# Throughput benchmarks for the engine, the fitness evaluator and a full GA
+# generation. Results are keyed by name so a saved JSON baseline can be diffed
+# against later runs to catch regressions.
+
+ENGINE_BOARD_SIZES = [20, 64, 256, 1024, 2048]
+FITNESS_BOARD_SIZE = 20
+FITNESS_SIMULATION_STEPS = 2000
+GENERATION_POPULATION_SIZE = 200
+DEFAULT_BASELINE_PATH = os.path.join("bench_results", "baseline.json")
+DEFAULT_TOLERANCE = 0.10
+
+def _best_time(function, min_seconds=0.2, repeats=3):
+    # best of a few runs, each run repeating the call until it lasts long
+    # enough to time reliably. returns seconds per call
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            break
+        calls *= 2
+
+    best = elapsed / calls
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+def place_pattern(cells, size):
+    board = np.zeros((size, size), dtype=int)
+    cells = np.array(cells, dtype=int)
+    offset_y = (size - cells.shape[0]) // 2
+    offset_x = (size - cells.shape[1]) // 2
+    board[offset_y:offset_y + cells.shape[0], offset_x:offset_x + cells.shape[1]] = cells
+    return board
+
+def canonical_patterns(size=FITNESS_BOARD_SIZE, seed=0):
+    return {
+        "glider": place_pattern([[0, 1, 0], [0, 0, 1], [1, 1, 1]], size),
+        "blinker": place_pattern([[1, 1, 1]], size),
+        "r_pentomino": place_pattern([[0, 1, 1], [1, 1, 0], [0, 1, 0]], size),
+        "random_soup": make_rng(seed).integers(0, 2, size=(size, size), dtype=int),
+    }
+
+def bench_engine(sizes=ENGINE_BOARD_SIZES, seed=0):
+    results = {}
+    rng = make_rng(seed)
+    for size in sizes:
+        board = rng.integers(0, 2, size=(size, size), dtype=int)
+        packed = pack_board(board)
+        engines = {
+            "next_board_state": lambda: next_board_state(board),
+            # any rule other than B3/S23 takes the lookup table path
+            "next_board_state_highlife": lambda: next_board_state(board, rule="B36/S23"),
+            "next_packed_state": lambda: next_packed_state(packed, size),
+        }
+        for engine_name, step in engines.items():
+            seconds = _best_time(step)
+            results[f"engine/{engine_name}/{size}x{size}"] = {
+                "seconds": seconds,
+                "cell_updates_per_s": size * size / seconds,
+                "boards_per_s": 1 / seconds,
+            }
+    return results
+
+def bench_fitness(patterns=None, simulation_steps=FITNESS_SIMULATION_STEPS):
+    results = {}
+    patterns = patterns if patterns is not None else canonical_patterns()
+    for pattern_name, board in patterns.items():
+        generations = calculate_fitness(board, simulation_steps)
+        seconds = _best_time(lambda: calculate_fitness(board, simulation_steps))
+        results[f"fitness/{pattern_name}"] = {
+            "seconds": seconds,
+            "generations": generations,
+            "cell_updates_per_s": generations * board.size / seconds,
+            "boards_per_s": 1 / seconds,
+        }
+    return results
+
+def bench_generation(population_size=GENERATION_POPULATION_SIZE, board_size=FITNESS_BOARD_SIZE,
+                     simulation_steps=FITNESS_SIMULATION_STEPS, seed=0):
+    # one full evolve_patterns generation: evaluation, selection and breeding
+    run = lambda: evolve_patterns(population_size=population_size, num_generations=1,
+                                  simulation_steps=simulation_steps, board_width=board_size,
+                                  board_height=board_size, seed=seed, num_workers=1,
+                                  fitness_cache_size=0, trajectory_cache_size=0, verbose=False)
+    seconds = _best_time(run, min_seconds=0, repeats=3)
+    return {
+        f"generation/{population_size}x{board_size}x{board_size}": {
+            "seconds": seconds,
+            "boards_per_s": population_size / seconds,
+        }
+    }
+
+def run_benchmarks(engine_sizes=ENGINE_BOARD_SIZES, population_size=GENERATION_POPULATION_SIZE,
+                   simulation_steps=FITNESS_SIMULATION_STEPS):
+    results = {}
+    results.update(bench_engine(engine_sizes))
+    results.update(bench_fitness(simulation_steps=simulation_steps))
+    results.update(bench_generation(population_size, simulation_steps=simulation_steps))
+    return {
+        "timestamp": time.strftime("%Y%m%d-%H%M%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "results": results,
+    }
+
+def save_baseline(report, path=DEFAULT_BASELINE_PATH):
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def load_baseline(path=DEFAULT_BASELINE_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+def compare_reports(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    # ratio > 1 means the current run is faster. anything slower than the
+    # baseline by more than the tolerance is reported as a regression
+    comparisons = []
+    for name, current_result in current["results"].items():
+        baseline_result = baseline["results"].get(name)
+        if baseline_result is None:
+            continue
+        ratio = baseline_result["seconds"] / current_result["seconds"]
+        comparisons.append((name, ratio, ratio < 1 - tolerance))
+    return comparisons
+
+def print_report(report):
+    print(f"{'benchmark':<40} {'seconds':>12} {'cell updates/s':>16} {'boards/s':>12}")
+    for name, result in report["results"].items():
+        cell_updates = result.get("cell_updates_per_s")
+        cell_updates = f"{cell_updates:16.3e}" if cell_updates is not None else f"{'-':>16}"
+        print(f"{name:<40} {result['seconds']:12.6f} {cell_updates} {result['boards_per_s']:12.1f}")
+
+def print_comparison(comparisons):
+    for name, ratio, is_regression in comparisons:
+        marker = "  REGRESSION" if is_regression else ""
+        print(f"{name:<40} {ratio:6.2f}x{marker}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Life engine, fitness evaluation and GA generation loop.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=ENGINE_BOARD_SIZES, help="board sizes for the engine benchmark")
+    parser.add_argument("--population-size", type=int, default=GENERATION_POPULATION_SIZE)
+    parser.add_argument("--simulation-steps", type=int, default=FITNESS_SIMULATION_STEPS)
+    parser.add_argument("--save-baseline", metavar="PATH", nargs="?", const=DEFAULT_BASELINE_PATH,
+                        help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", nargs="?", const=DEFAULT_BASELINE_PATH,
+                        help="diff the results against a saved JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a result counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.population_size, args.simulation_steps)
+    print_report(report)
+
+    exit_code = 0
+    if args.compare:
+        print(f"\nCompared with {args.compare} (higher is faster):")
+        comparisons = compare_reports(load_baseline(args.compare), report, args.tolerance)
+        print_comparison(comparisons)
+        if any(is_regression for _, _, is_regression in comparisons):
+            exit_code = 1
+    if args.save_baseline:
+        save_baseline(report, args.save_baseline)
+        print(f"\nBaseline written to {args.save_baseline}")
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
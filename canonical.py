@@ -0,0 +1,81 @@
+import hashlib
+import numpy as np
+
+# Canonical forms of patterns up to the symmetries that leave their fitness
+# unchanged. Life-like rules only count neighbours, so rotating or mirroring
+# a board rotates or mirrors its whole future: the lifetime is the same. A
+# square board has the 8 symmetries of the square (D4); a rectangular one
+# only keeps its shape under the 4 that do not swap width and height. On the
+# infinite plane translations do not matter either, so patterns are cropped
+# to their bounding box first. On the dead border (and the torus) a pattern's
+# position does matter, so bounded boards are never cropped.
+
+def crop_to_content(board):
+    # the bounding box of the live cells, (0, 0) when there are none
+    rows = np.flatnonzero(board.any(axis=1))
+    columns = np.flatnonzero(board.any(axis=0))
+    if not len(rows):
+        return board[:0, :0]
+    return board[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+
+def board_symmetries(board):
+    # every orientation of board that keeps its shape, board itself first.
+    # only the first two axes are turned, so a stack of boards with the
+    # board axis last is turned as a whole
+    orientations = [board, board[::-1], board[:, ::-1], board[::-1, ::-1]]
+    if board.shape[0] == board.shape[1] or board.size == 0:
+        transposed = np.swapaxes(board, 0, 1)
+        orientations += [transposed, transposed[::-1], transposed[:, ::-1], transposed[::-1, ::-1]]
+    return orientations
+
+def _orientation_key(board):
+    # like fitness_cache.board_key, but as one bytes object: the shape, then
+    # one bit per cell
+    return np.array(board.shape, dtype=np.uint32).tobytes() + np.packbits(board).tobytes()
+
+def canonical_board(board, boundary="dead"):
+    # the orientation with the smallest key, so all symmetric copies of a
+    # pattern map to the same board
+    board = np.asarray(board) == 1
+    if boundary == "infinite":
+        board = crop_to_content(board)
+    return min(board_symmetries(board), key=_orientation_key).astype(np.uint8)
+
+def canonical_key(board, boundary="dead"):
+    # exact key of the canonical form, usable as a FitnessCache key_function
+    board = np.asarray(board) == 1
+    if boundary == "infinite":
+        board = crop_to_content(board)
+    return min(_orientation_key(orientation) for orientation in board_symmetries(board))
+
+def _hash_key(key):
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+def canonical_hash(board, boundary="dead"):
+    # 64-bit hash of the canonical form, for counting and deduplication
+    return _hash_key(canonical_key(board, boundary))
+
+def canonical_hashes(population, boundary="dead"):
+    if boundary == "infinite":
+        return [canonical_hash(board, boundary) for board in population]
+    # bounded boards all share one shape, so the orientations of the whole
+    # population are packed at once and only the minimum is picked per board
+    boards = np.asarray(population) == 1
+    orientations = np.stack(board_symmetries(boards.transpose(1, 2, 0)))
+    num_orientations, height, width, num_boards = orientations.shape
+    packed = np.packbits(orientations.transpose(0, 3, 1, 2).reshape(num_orientations, num_boards, -1), axis=-1)
+    shape_bytes = np.array((height, width), dtype=np.uint32).tobytes()
+    return [_hash_key(shape_bytes + min(orientation.tobytes() for orientation in packed[:, index]))
+            for index in range(num_boards)]
+
+def duplicate_mask(population, boundary="dead"):
+    # True for every board that is a symmetric copy of an earlier board
+    seen = set()
+    mask = np.zeros(len(population), dtype=bool)
+    for index, board_hash in enumerate(canonical_hashes(population, boundary)):
+        mask[index] = board_hash in seen
+        seen.add(board_hash)
+    return mask
+
+def count_distinct(population, boundary="dead"):
+    return len(set(canonical_hashes(population, boundary)))
@@ -0,0 +1,68 @@
+import json
+import os
+import numpy as np
+from bitboard import pack_board, unpack_board
+
+# Checkpoints of a running GA as a single compressed .npz: boards stored
+# bit-packed, plus the RNG state and the run settings as JSON. Everything the
+# next generation depends on is saved, so a resumed run continues exactly as
+# the uninterrupted run would have.
+
+CHECKPOINT_VERSION = 1
+# settings that change the course of a run. the others (the generation count,
+# the cycle detector, the engine) may differ when resuming
+RESUME_SETTINGS = ("population_size", "mutation_rate", "simulation_steps", "board_width", "board_height",
+                   "fitness_threshold", "crossover_rate", "tournament_size", "selection", "boundary", "rule",
+                   "deduplicate")
+
+def save_checkpoint(path, population, fitnesses, best_individual, best_fitness, fitness_history, generation, rng,
+                    settings):
+    # generation is the next generation to run and population its boards,
+    # fitnesses belong to the generation they were bred from. written to a
+    # temporary file first so a crash mid-write never leaves a torn checkpoint
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    population = np.array(population)
+    metadata = {
+        "version": CHECKPOINT_VERSION,
+        "generation": generation,
+        "best_fitness": int(best_fitness),
+        "board_width": int(population.shape[-1]),
+        "rng_state": rng.bit_generator.state,
+        "settings": settings,
+    }
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        np.savez_compressed(f, population=pack_board(population), best_individual=pack_board(best_individual),
+                            fitnesses=np.array(fitnesses, dtype=np.int64),
+                            fitness_history=np.array(fitness_history, dtype=np.int64),
+                            metadata=np.array(json.dumps(metadata)))
+    os.replace(temporary_path, path)
+
+def load_checkpoint(path):
+    with np.load(path) as data:
+        metadata = json.loads(str(data["metadata"]))
+        if metadata["version"] != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {metadata['version']} in {path}")
+        board_width = metadata["board_width"]
+        return {
+            "population": list(unpack_board(data["population"], board_width)),
+            "fitnesses": data["fitnesses"].tolist(),
+            "best_individual": unpack_board(data["best_individual"], board_width),
+            "best_fitness": metadata["best_fitness"],
+            "fitness_history": data["fitness_history"].tolist(),
+            "generation": metadata["generation"],
+            "rng_state": metadata["rng_state"],
+            "settings": metadata["settings"],
+        }
+
+def restore_rng(rng, rng_state):
+    rng.bit_generator.state = rng_state
+    return rng
+
+def check_resume_settings(saved_settings, settings):
+    mismatched = [name for name in RESUME_SETTINGS if saved_settings.get(name) != settings.get(name)]
+    if mismatched:
+        details = ", ".join(f"{name}={saved_settings.get(name)!r} (now {settings.get(name)!r})" for name in mismatched)
+        raise ValueError(f"Checkpoint was written with different settings: {details}")
@@ -0,0 +1,132 @@
+import numpy as np
+import os
+import pickle
+from collections import OrderedDict
+from game_of_life import DEFAULT_RULE, normalize_rule
+from ga_parameters import ga_fitness_cache_size, ga_trajectory_cache_size
+
+def board_key(board):
+    # one bit per cell plus the shape, since packbits pads the last byte
+    return board.shape, np.packbits(board == 1).tobytes()
+
+class FitnessCache:
+    # size-bounded LRU of fitness values. elites and the copies of the best
+    # individual that fill up each generation are looked up instead of being
+    # simulated again
+    def __init__(self, max_size=ga_fitness_cache_size, key_function=board_key):
+        self.max_size = max_size
+        self.key_function = key_function
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def key(self, board, num_simulation_steps, boundary="dead", rule=DEFAULT_RULE):
+        # the same board has a different lifetime under each boundary and rule
+        return boundary, normalize_rule(rule), num_simulation_steps, self.key_function(board)
+
+    def get(self, key):
+        fitness = self._entries.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return fitness
+
+    def put(self, key, fitness):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = fitness
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+class TrajectoryCache:
+    # transposition table shared by every individual. for each state reached
+    # by a finished simulation it stores the fitness that state would have
+    # as a starting board, plus whether the state lies on its own cycle.
+    # a trajectory that reaches a known tail state at generation t has
+    # fitness t + remaining without simulating the rest. cycle states are
+    # not enough on their own (the new trajectory may have entered the cycle
+    # earlier) so those hits just keep simulating
+    def __init__(self, max_size=ga_trajectory_cache_size, key_function=board_key, boundary="dead", rule=DEFAULT_RULE):
+        self.max_size = max_size
+        self.key_function = key_function
+        # every stored trajectory was simulated under this boundary and rule
+        self.boundary = boundary
+        self.rule = normalize_rule(rule)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def key(self, board):
+        return self.key_function(board)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, remaining, on_cycle):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (remaining, on_cycle)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def record_end(self, trajectory_keys, fitness):
+        # the trajectory died, or ran into a known tail state, at generation
+        # fitness, so none of its states are on a cycle
+        for generation, key in enumerate(trajectory_keys):
+            self.put(key, fitness - generation, False)
+
+    def record_cycle(self, trajectory_keys, cycle_start, fitness):
+        period = fitness - cycle_start
+        for generation, key in enumerate(trajectory_keys):
+            if generation < cycle_start:
+                self.put(key, fitness - generation, False)
+            else:
+                self.put(key, period, True)
+
+    def save(self, path):
+        # written to a temporary file first so a crash never leaves a torn file
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as f:
+            pickle.dump((self.boundary, self.rule, list(self._entries.items())), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path, max_size=ga_trajectory_cache_size, key_function=board_key):
+        with open(path, "rb") as f:
+            boundary, rule, entries = pickle.load(f)
+        cache = cls(max_size, key_function, boundary, rule)
+        for key, (remaining, on_cycle) in entries:
+            cache.put(key, remaining, on_cycle)
+        return cache
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
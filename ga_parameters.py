@@ -7,6 +7,30 @@ ga_board_height = 20
 ga_fitness_threshold = 2001
 ga_crossover_rate = 0.8   
 ga_tournament_size = 5       
+ga_selection = "tournament" # "tournament", "rank" (linear ranking) or "sus" (stochastic universal sampling)
+ga_seed = None # set an int to make a run reproducible
+ga_num_workers = 1 # >1 evaluates fitness in a process pool, boards are shipped bit-packed
+ga_fitness_cache_size = 10000 # max boards kept in the LRU fitness cache, 0 disables it
+ga_trajectory_cache_size = 0 # states kept in the shared trajectory table, 0 disables it
+ga_trajectory_cache_path = None # e.g. "ga_results/trajectories.pkl" to keep the table between runs
+ga_engine = "numpy" # "hashlife" jumps generations, for horizons of 10**5 steps and more
+ga_cycle_detection = "set" # "set", "hash" (64-bit hash per step) or "brent" (constant memory)
+ga_boundary = "dead" # "dead" border, "torus" wraps around, "infinite" grows the board as patterns spread
    
  
 
+ga_rule = "B3/S23" # life-like rulestring, e.g. "B36/S23" for HighLife
+ga_num_islands = 4 # sub-populations for islands.evolve_islands, one process each
+ga_migration_interval = 10 # generations between migrations
+ga_migration_size = 2 # best individuals each island sends to the next one
+ga_checkpoint_path = None # e.g. "ga_results/checkpoint.npz" to checkpoint the run periodically
+ga_checkpoint_interval = 10 # generations between checkpoints
+ga_metrics_path = None # e.g. "ga_results/metrics.csv" (or .jsonl) to stream per-generation metrics
+ga_metrics_flush_seconds = 5.0 # buffered metric rows are written out at least this often
+ga_population_store_path = None # e.g. "ga_results/population.mmap" keeps the population in a memory-mapped file
+ga_profile = False # phase timers and simulation counters for evolve_patterns, off costs nothing
+ga_profile_path = None # e.g. "ga_results/profile.json" for the summary at the end of the run
+ga_profile_window = None # (first, last) generation to run cProfile over, e.g. (2, 3)
+ga_tracemalloc_window = None # (first, last) generation to trace memory allocations over
+ga_canonical_cache = False # fitness cache keys ignore rotations and reflections (and position on the infinite plane), pays off once the population converges
+ga_deduplicate = False # replace offspring that are rotated or mirrored copies of another board with random boards
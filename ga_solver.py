@@ -1,15 +1,28 @@
 import numpy as np
-from game_of_life import(next_board_state, random_state, random)
+import os
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from game_of_life import(next_board_state, random_state, make_rng, BOUNDARIES,
+                         board_to_cells, next_cells_state, normalize_rule, DEFAULT_RULE)
+from bitboard import pack_board, unpack_board, next_packed_state
 from ga_parameters import *
+from fitness_cache import FitnessCache, TrajectoryCache
+from hashlife import HashLife, hashlife_fitness
+from checkpoint import save_checkpoint, load_checkpoint, restore_rng, check_resume_settings
+from metrics import MetricsWriter, generation_metrics, METRIC_FIELDS
+from population_store import PopulationStore
+from profiling import Instrumentation, PROFILE_FIELDS, phase
+from canonical import canonical_key, duplicate_mask
 
-def calculate_fitness ( board, num_simulation_steps):
+def _fitness_visited_set(board, num_simulation_steps, step=next_board_state):
     current_sim_board = board.copy()
     visited_states = set()
     visited_states.add(current_sim_board.tobytes())
     
     #previous_sim_board = None
     for generation in range(1, num_simulation_steps + 1):
-        next_sim_board = next_board_state(current_sim_board)
+        next_sim_board = step(current_sim_board)
         
         if not next_sim_board.any():
             return generation 
@@ -26,99 +39,662 @@ def calculate_fitness ( board, num_simulation_steps):
         #previous_sim_board = current_sim_board.copy()
         current_sim_board = next_sim_board.copy()
     return num_simulation_steps
+
+def _board_after(board, generations, step=next_board_state):
+    for _ in range(generations):
+        board = step(board)
+    return board
+
+# generations between the boards _fitness_hash_index keeps to replay from
+HASH_SNAPSHOT_INTERVAL = 32
+
+def _fitness_hash_index(board, num_simulation_steps, step=next_board_state):
+    # keeps one 64-bit hash per visited generation instead of the whole board,
+    # plus a snapshot every HASH_SNAPSHOT_INTERVAL generations. a hash hit is
+    # confirmed by replaying from the nearest snapshot to the earlier
+    # generation, so a collision can never end a simulation early and the
+    # check costs fewer than HASH_SNAPSHOT_INTERVAL steps
+    current_sim_board = board.copy()
+    seen_generations = {hash(current_sim_board.tobytes()): (0,)}
+    snapshots = [current_sim_board]
+
+    for generation in range(1, num_simulation_steps + 1):
+        current_sim_board = step(current_sim_board)
+
+        if not current_sim_board.any():
+            return generation
+
+        board_hash = hash(current_sim_board.tobytes())
+        earlier_generations = seen_generations.get(board_hash, ())
+        for earlier_generation in earlier_generations:
+            snapshot = snapshots[earlier_generation // HASH_SNAPSHOT_INTERVAL]
+            earlier_board = _board_after(snapshot, earlier_generation % HASH_SNAPSHOT_INTERVAL, step)
+            if np.array_equal(earlier_board, current_sim_board):
+                return generation
+        seen_generations[board_hash] = earlier_generations + (generation,)
+        if generation % HASH_SNAPSHOT_INTERVAL == 0:
+            snapshots.append(current_sim_board)
+    return num_simulation_steps
+
+def _fitness_brent(board, num_simulation_steps, step=next_board_state):
+    # Brent's cycle finding with constant memory. the fitness is the first
+    # generation that dies or repeats an earlier state, i.e. tail + period.
+    # phase one finds the period; while power >= period and the tortoise is
+    # past the tail it must stop, so 3 * steps + 2 generations always suffice
+    hare = step(board)
+    hare_generation = 1
+    if not hare.any():
+        return min(hare_generation, num_simulation_steps)
+
+    tortoise = board
+    power = period = 1
+    while not np.array_equal(tortoise, hare):
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        hare = step(hare)
+        hare_generation += 1
+        period += 1
+
+        # the empty board is a fixed point that nothing else cycles into, so
+        # the first empty generation is exactly the generation of death
+        if not hare.any():
+            return min(hare_generation, num_simulation_steps)
+        if hare_generation > 3 * num_simulation_steps + 2:
+            return num_simulation_steps
+
+    if period > num_simulation_steps:
+        return num_simulation_steps
+
+    tortoise = board
+    hare = _board_after(board, period, step)
+    tail_length = 0
+    while not np.array_equal(tortoise, hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        tail_length += 1
+        if tail_length + period > num_simulation_steps:
+            return num_simulation_steps
+    return tail_length + period
+
+CYCLE_DETECTORS = {
+    "set": _fitness_visited_set,
+    "hash": _fitness_hash_index,
+    "brent": _fitness_brent,
+}
+
+def _fitness_trajectory_cached(board, num_simulation_steps, trajectory_cache, step=next_board_state):
+    # visited-set simulation that stops as soon as it reaches a tail state
+    # another individual already resolved, then records its own states
+    current_sim_board = board.copy()
+    current_key = trajectory_cache.key(current_sim_board)
+    entry = trajectory_cache.get(current_key)
+    if entry is not None and not entry[1]:
+        return min(entry[0], num_simulation_steps)
+
+    trajectory_keys = [current_key]
+    visited_generations = {current_key: 0}
+    for generation in range(1, num_simulation_steps + 1):
+        current_sim_board = step(current_sim_board)
+
+        if not current_sim_board.any():
+            trajectory_cache.record_end(trajectory_keys, generation)
+            return generation
+
+        current_key = trajectory_cache.key(current_sim_board)
+        if current_key in visited_generations:
+            trajectory_cache.record_cycle(trajectory_keys, visited_generations[current_key], generation)
+            return generation
+
+        entry = trajectory_cache.get(current_key)
+        if entry is not None and not entry[1]:
+            fitness = generation + entry[0]
+            trajectory_cache.record_end(trajectory_keys, fitness)
+            return min(fitness, num_simulation_steps)
+
+        visited_generations[current_key] = generation
+        trajectory_keys.append(current_key)
+    # ran out of steps without resolving, nothing is known past the horizon
+    return num_simulation_steps
+
+ENGINES = ("numpy", "hashlife")
+
+_hashlife_universe = None
+
+def _shared_hashlife_universe(rule=DEFAULT_RULE):
+    # one memo table per process, so patterns shared between individuals and
+    # generations are only ever computed once (it clears itself when full).
+    # memoized futures only hold for one rule, so a new rule starts afresh
+    global _hashlife_universe
+    if _hashlife_universe is None or _hashlife_universe.rule != rule:
+        _hashlife_universe = HashLife(rule=rule)
+    return _hashlife_universe
+
+def _fitness_infinite(board, num_simulation_steps, step=next_cells_state):
+    # the unbounded plane as a sparse set of live cell keys. states are
+    # compared by their absolute cells, so a glider never repeats
+    current_cells = board_to_cells(board)
+    visited_states = {current_cells.tobytes()}
+    for generation in range(1, num_simulation_steps + 1):
+        current_cells = step(current_cells)
+        if len(current_cells) == 0:
+            return generation
+        cells_bytes = current_cells.tobytes()
+        if cells_bytes in visited_states:
+            return generation
+        visited_states.add(cells_bytes)
+    return num_simulation_steps
+
+def _counted_step(step, instrumentation):
+    # counts every generation actually computed, so detectors that step twice
+    # (brent) or stop early on a cached tail (trajectories) report their real work
+    def counted_step(state):
+        instrumentation.count("steps_simulated")
+        return step(state)
+    return counted_step
+
+def calculate_fitness ( board, num_simulation_steps, cycle_detection=ga_cycle_detection, trajectory_cache=None, engine=ga_engine,
+                        boundary=ga_boundary, rule=ga_rule, instrumentation=None):
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine!r}")
+    if boundary not in BOUNDARIES:
+        raise ValueError(f"Unknown boundary: {boundary!r}")
+    rule = normalize_rule(rule)
+    # visited states are compared as raw bytes, so every board is stepped as
+    # the int arrays next_board_state returns (populations are stored as uint8)
+    board = (np.asarray(board) == 1).astype(int)
+    if boundary == "infinite":
+        # the unbounded plane always uses its sparse cell-set engine
+        step = partial(next_cells_state, rule=rule)
+        if instrumentation is not None:
+            step = _counted_step(step, instrumentation)
+        return _fitness_infinite(board, num_simulation_steps, step)
+    if engine == "hashlife":
+        if boundary != "dead":
+            raise ValueError("The hashlife engine only supports the dead boundary")
+        # hashlife jumps whole blocks of generations at once and never takes a
+        # single step, so it adds nothing to steps_simulated
+        return hashlife_fitness(board, num_simulation_steps, _shared_hashlife_universe(rule))
+
+    step = partial(next_board_state, boundary=boundary, rule=rule)
+    if instrumentation is not None:
+        step = _counted_step(step, instrumentation)
+    if trajectory_cache is not None:
+        if (trajectory_cache.boundary, trajectory_cache.rule) != (boundary, rule):
+            raise ValueError(f"Trajectory cache holds {trajectory_cache.boundary!r} {trajectory_cache.rule} results, "
+                             f"not {boundary!r} {rule}")
+        return _fitness_trajectory_cached(board, num_simulation_steps, trajectory_cache, step)
+    if cycle_detection not in CYCLE_DETECTORS:
+        raise ValueError(f"Unknown cycle detection strategy: {cycle_detection!r}")
+    return CYCLE_DETECTORS[cycle_detection](board, num_simulation_steps, step)
+
+def calculate_population_fitness(population, num_simulation_steps, instrumentation=None):
+    # same result as calling calculate_fitness on every board, but the whole
+    # population is stepped as one bit-packed (N, H, words) array. boards that
+    # died or repeated a state drop out of the live mask and stop being simulated.
+    # with an Instrumentation the steps, deaths and cycles are counted
+    board_width = population[0].shape[-1]
+    current_boards = pack_board(np.array(population))
+    num_boards = len(current_boards)
+    fitnesses = np.full(num_boards, num_simulation_steps, dtype=int)
+    visited_states = [{board.tobytes()} for board in current_boards]
+    live_mask = np.ones(num_boards, dtype=bool)
+    if instrumentation is not None:
+        instrumentation.count("boards_simulated", num_boards)
+
+    for generation in range(1, num_simulation_steps + 1):
+        if not live_mask.any():
+            break
+        live_indices = np.flatnonzero(live_mask)
+        current_boards[live_indices] = next_packed_state(current_boards[live_indices], board_width)
+        if instrumentation is not None:
+            instrumentation.count("steps_simulated", len(live_indices))
+
+        still_alive = current_boards[live_indices].any(axis=(1, 2))
+        for index, alive in zip(live_indices, still_alive):
+            board_bytes = current_boards[index].tobytes()
+            if not alive or board_bytes in visited_states[index]:
+                fitnesses[index] = generation
+                live_mask[index] = False
+                visited_states[index] = None
+                if instrumentation is not None:
+                    instrumentation.count("boards_resolved")
+                    instrumentation.count("cycles_detected" if alive else "early_deaths")
+                continue
+            visited_states[index].add(board_bytes)
+    return fitnesses.tolist()
     
-def create_initial_population(population_size, width, height):
+def _evaluate_packed_chunk(packed_bytes, chunk_shape, num_simulation_steps, fitness_options, instrumentation=None):
+    # runs in a worker process. boards arrive bit-packed (one bit per cell)
+    # so a 20x20 board costs 160 bytes to ship instead of a pickled int64 array
+    num_boards, board_height, board_width = chunk_shape
+    packed = np.frombuffer(packed_bytes, dtype=np.uint64).reshape(num_boards, board_height, -1)
+    boards = unpack_board(packed, board_width)
+    return evaluate_population(boards, num_simulation_steps, instrumentation=instrumentation, **fitness_options)
+
+def _evaluate_counted_chunk(packed_bytes, chunk_shape, num_simulation_steps, fitness_options):
+    # the same in a profiled run, the worker's counters travel back with the fitnesses
+    instrumentation = Instrumentation()
+    fitnesses = _evaluate_packed_chunk(packed_bytes, chunk_shape, num_simulation_steps, fitness_options, instrumentation)
+    return fitnesses, instrumentation.counters
+
+def _evaluate_in_pool(population, num_simulation_steps, executor, num_chunks, fitness_options, instrumentation=None):
+    boards = np.array(population)
+    worker = _evaluate_packed_chunk if instrumentation is None else _evaluate_counted_chunk
+    futures = []
+    for chunk in np.array_split(boards, num_chunks):
+        if len(chunk) == 0:
+            continue
+        futures.append(executor.submit(
+            worker, pack_board(chunk).tobytes(), chunk.shape, num_simulation_steps, fitness_options))
+
+    fitnesses = []
+    for future in futures:
+        if instrumentation is None:
+            fitnesses.extend(future.result())
+            continue
+        chunk_fitnesses, counters = future.result()
+        fitnesses.extend(chunk_fitnesses)
+        for name, amount in counters.items():
+            instrumentation.count(name, amount)
+    return fitnesses
+
+def _uses_packed_batch(fitness_options):
+    # the packed batch kernel implements Conway's rule on the dead border only
+    return (fitness_options.get("engine", ga_engine) == "numpy"
+            and fitness_options.get("cycle_detection", ga_cycle_detection) == "set"
+            and fitness_options.get("boundary", ga_boundary) == "dead"
+            and normalize_rule(fitness_options.get("rule", ga_rule)) == DEFAULT_RULE)
+
+def _count_simulated(instrumentation, fitnesses, num_simulation_steps):
+    # steps are counted as they are taken (see _counted_step). the fitness
+    # alone cannot tell a death from a cycle, only the packed batch kernel
+    # counts those separately
+    instrumentation.count("boards_simulated", len(fitnesses))
+    instrumentation.count("boards_resolved", sum(fitness < num_simulation_steps for fitness in fitnesses))
+
+def _evaluate_uncached(population, num_simulation_steps, executor, num_chunks, trajectory_cache, fitness_options,
+                       instrumentation=None):
+    uses_numpy_engine = fitness_options.get("engine", ga_engine) == "numpy"
+    is_bounded = fitness_options.get("boundary", ga_boundary) != "infinite"
+    if trajectory_cache is not None and uses_numpy_engine and is_bounded:
+        # the trajectory table lives in this process, so it is always serial
+        fitnesses = [calculate_fitness(individual, num_simulation_steps, trajectory_cache=trajectory_cache,
+                                       instrumentation=instrumentation, **fitness_options)
+                     for individual in population]
+    elif executor is not None:
+        # the workers count for themselves
+        return _evaluate_in_pool(population, num_simulation_steps, executor, num_chunks, fitness_options, instrumentation)
+    elif _uses_packed_batch(fitness_options):
+        return calculate_population_fitness(population, num_simulation_steps, instrumentation)
+    else:
+        fitnesses = [calculate_fitness(individual, num_simulation_steps, instrumentation=instrumentation, **fitness_options)
+                     for individual in population]
+    if instrumentation is not None:
+        _count_simulated(instrumentation, fitnesses, num_simulation_steps)
+    return fitnesses
+
+def evaluate_population(population, num_simulation_steps, cycle_detection=ga_cycle_detection, executor=None, num_chunks=1,
+                        cache=None, trajectory_cache=None, instrumentation=None, **fitness_options):
+    # fitness_options are passed on to calculate_fitness (engine, ...)
+    fitness_options = dict(fitness_options, cycle_detection=cycle_detection)
+    if cache is None:
+        return _evaluate_uncached(population, num_simulation_steps, executor, num_chunks, trajectory_cache, fitness_options,
+                                  instrumentation)
+
+    # only boards missing from the cache are simulated, and duplicates within
+    # the population are simulated once
+    fitnesses = [None] * len(population)
+    pending = {}
+    for index, individual in enumerate(population):
+        key = cache.key(individual, num_simulation_steps, fitness_options.get("boundary", ga_boundary),
+                        fitness_options.get("rule", ga_rule))
+        if key in pending:
+            cache.hits += 1
+            pending[key].append(index)
+            continue
+        fitness = cache.get(key)
+        if fitness is None:
+            pending[key] = [index]
+        else:
+            fitnesses[index] = fitness
+
+    if pending:
+        boards_to_evaluate = [population[indices[0]] for indices in pending.values()]
+        results = _evaluate_uncached(boards_to_evaluate, num_simulation_steps, executor, num_chunks, trajectory_cache,
+                                     fitness_options, instrumentation)
+        for (key, indices), fitness in zip(pending.items(), results):
+            cache.put(key, fitness)
+            for index in indices:
+                fitnesses[index] = fitness
+    return fitnesses
+
+def create_initial_population(population_size, width, height, rng=None):
+    rng = rng if rng is not None else make_rng()
     population =[]
     for _ in range(population_size):
-        individual_board = random_state(width, height)
+        individual_board = random_state(width, height, rng)
         population.append(individual_board)
     return population 
 
-def select_parents(population, fitness, tournament_size):
-    participants = random.sample(list(zip(population, fitness)),tournament_size)
-    parent = max(participants, key= lambda x: x[1])
-    return parent[0]
+def select_parent_index(population_size, fitness, tournament_size, rng=None):
+    # same as random.sample + max: distinct participants, first one wins ties
+    rng = rng if rng is not None else make_rng()
+    participants = rng.choice(population_size, tournament_size, replace=False)
+    return max(participants, key= lambda index: fitness[index])
 
-def crossover(parent1, parent2):
-    board_height, board_width = parent1.shape
-    child1 = np.zeros((board_height, board_width), dtype = int)
-    child2 = np.zeros((board_height, board_width), dtype = int)
-    
-    for y in range(board_height):
-        for x in range(board_width):
-            if random.random() < 0.5:
-                child1[y, x] = parent1[y, x]
-                child2[y, x] = parent2[y, x]
-            else:
-                child2[y, x] = parent1[y, x]
-                child1[y, x] = parent2[y, x]
+def select_parents(population, fitness, tournament_size, rng=None):
+    return population[select_parent_index(len(population), fitness, tournament_size, rng)]
+
+# Selection schemes pick every parent of a generation in one call. Each takes
+# the fitness of the whole population, the number of parents wanted, the
+# tournament size (ignored by the schemes without tournaments) and the rng,
+# and returns an array of parent indices.
+
+RANK_SELECTION_PRESSURE = 1.5  # expected offspring of the best individual, between 1 and 2
+
+def _tournament_participants(population_size, num_tournaments, tournament_size, rng):
+    # an (num_tournaments, tournament_size) matrix of indices, distinct within
+    # each row. tournaments are drawn with replacement and repeats redrawn:
+    # while a row rarely has one (probability about 1 - exp(-t**2 / 2N)) the
+    # whole row is redrawn, above that only the repeated entries, so the cost
+    # stays O(T * t log t) without any N-wide buffer. tournaments of more than
+    # half the population take the first columns of a random permutation per
+    # row, there N < 2t keeps the rows small
+    if tournament_size > population_size:
+        raise ValueError(f"Tournament size {tournament_size} is larger than the population ({population_size})")
+    if 2 * tournament_size > population_size:
+        return rng.random((num_tournaments, population_size)).argsort(axis=1)[:, :tournament_size]
+    participants = rng.integers(0, population_size, size=(num_tournaments, tournament_size))
+    if tournament_size ** 2 <= population_size:
+        while True:
+            ordered = np.sort(participants, axis=1)
+            has_repeat = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not has_repeat.any():
+                return participants
+            participants[has_repeat] = rng.integers(0, population_size, size=(int(has_repeat.sum()), tournament_size))
+
+    rows = np.arange(num_tournaments)
+    while len(rows):
+        order = participants[rows].argsort(axis=1, kind="stable")
+        ordered = np.take_along_axis(participants[rows], order, axis=1)
+        # every entry equal to the one before it in sorted order is redrawn
+        repeat_rows, repeat_positions = np.nonzero(ordered[:, 1:] == ordered[:, :-1])
+        columns = order[repeat_rows, repeat_positions + 1]
+        participants[rows[repeat_rows], columns] = rng.integers(0, population_size, size=len(columns))
+        rows = np.unique(rows[repeat_rows])
+    return participants
+
+def select_tournament(fitnesses, num_parents, tournament_size, rng):
+    # the fittest of tournament_size distinct individuals, first one wins ties
+    fitnesses = np.asarray(fitnesses)
+    participants = _tournament_participants(len(fitnesses), num_parents, tournament_size, rng)
+    winners = fitnesses[participants].argmax(axis=1)
+    return participants[np.arange(num_parents), winners]
+
+def select_rank(fitnesses, num_parents, tournament_size, rng):
+    # linear ranking: the selection probability depends only on the rank,
+    # from (2 - pressure) / N for the worst to pressure / N for the best
+    fitnesses = np.asarray(fitnesses)
+    population_size = len(fitnesses)
+    if population_size == 1:
+        return np.zeros(num_parents, dtype=int)
+    ranks = np.empty(population_size)
+    ranks[np.argsort(fitnesses, kind="stable")] = np.arange(population_size)
+    probabilities = ((2 - RANK_SELECTION_PRESSURE) + 2 * (RANK_SELECTION_PRESSURE - 1) * ranks / (population_size - 1)) / population_size
+    return rng.choice(population_size, size=num_parents, p=probabilities / probabilities.sum())
+
+def select_sus(fitnesses, num_parents, tournament_size, rng):
+    # stochastic universal sampling: fitness-proportional, with evenly spaced
+    # pointers from one random offset so the counts stay close to expected.
+    # shuffled afterwards so that parent pairs are random
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    total_fitness = fitnesses.sum()
+    if total_fitness <= 0:
+        return rng.integers(0, len(fitnesses), size=num_parents)
+    spacing = total_fitness / num_parents
+    pointers = rng.random() * spacing + spacing * np.arange(num_parents)
+    selected = np.searchsorted(np.cumsum(fitnesses), pointers, side="right")
+    return rng.permutation(np.minimum(selected, len(fitnesses) - 1))
+
+SELECTION_SCHEMES = {
+    "tournament": select_tournament,
+    "rank": select_rank,
+    "sus": select_sus,
+}
+
+def crossover(parent1, parent2, rng=None):
+    # uniform crossover: every cell comes from either parent with probability
+    # 0.5. works on single boards or on (N, H, W) stacks of parent pairs
+    rng = rng if rng is not None else make_rng()
+    keep_cell = rng.random(parent1.shape) < 0.5
+    child1 = np.where(keep_cell, parent1, parent2)
+    child2 = np.where(keep_cell, parent2, parent1)
+    return child1, child2
+
+def crossover_batch(parents1, parents2, crossover_rate, rng=None):
+    # crosses a whole batch of parent pairs at once. each pair is crossed
+    # with probability crossover_rate, otherwise the children are copies
+    rng = rng if rng is not None else make_rng()
+    keep_cell = rng.random(parents1.shape) < 0.5
+    is_crossed = rng.random(len(parents1)) < crossover_rate
+    keep_cell[~is_crossed] = True
+    child1 = np.where(keep_cell, parents1, parents2)
+    child2 = np.where(keep_cell, parents2, parents1)
     return child1, child2
             
-def mutation(individual, mutation_rate):
-    mutated_individual = individual.copy()
-    board_height, board_width = individual.shape
+def mutation(individual, mutation_rate, rng=None):
+    # flips each cell independently with probability mutation_rate. also
+    # works on a whole (N, H, W) batch of offspring
+    rng = rng if rng is not None else make_rng()
+    flip_cell = rng.random(individual.shape) < mutation_rate
+    return np.where(flip_cell, 1 - individual, individual)
 
-    for y in range(board_height):
-        for x in range(board_width):
-            if random.random() < mutation_rate:
-                mutated_individual[y, x] = 1 - mutated_individual[y, x]
-    return mutated_individual
+def breed_population(population, fitnesses, best_individual, population_size, crossover_rate, mutation_rate,
+                     tournament_size, rng, out=None, selection=ga_selection, instrumentation=None):
+    # one generation of breeding: the current elite, tournament-selected and
+    # mutated offspring, and copies of the best individual so far as filler.
+    # all parents are picked at once by index (see SELECTION_SCHEMES), and the
+    # offspring are written into
+    # out, an (N, H, W) array such as PopulationStore.next, or a new array.
+    # with an Instrumentation each part is timed as its own phase
+    population = np.asarray(population)
+    if out is None:
+        out = np.empty((population_size,) + population.shape[1:], dtype=population.dtype)
+    with phase(instrumentation, "copy"):
+        out[0] = population[int(np.argmax(fitnesses))]  # the elite takes the first spot
+    number_of_pairs = (population_size - 1) // 2
+    if number_of_pairs:
+        with phase(instrumentation, "selection"):
+            if selection not in SELECTION_SCHEMES:
+                raise ValueError(f"Unknown selection scheme: {selection!r}")
+            parent_indices = SELECTION_SCHEMES[selection](fitnesses, 2 * number_of_pairs, tournament_size, rng)
+            parent_indices = parent_indices.reshape(number_of_pairs, 2)
+        with phase(instrumentation, "crossover"):
+            children1, children2 = crossover_batch(population[parent_indices[:, 0]], population[parent_indices[:, 1]],
+                                                   crossover_rate, rng)
+        with phase(instrumentation, "mutation"):
+            out[1:2 * number_of_pairs + 1:2] = mutation(children1, mutation_rate, rng)
+            out[2:2 * number_of_pairs + 2:2] = mutation(children2, mutation_rate, rng)
+    with phase(instrumentation, "copy"):
+        out[2 * number_of_pairs + 1:] = best_individual
+    return out
 
-def evolve_patterns():
-    
-    #population = create_initial_population(pop_size, board_width, board_height)
-    population = create_initial_population(ga_population_size, ga_board_width, ga_board_height)
+def make_fitness_cache(max_size, boundary=ga_boundary, canonical=ga_canonical_cache):
+    # with canonical keys the rotated and mirrored copies of a board (and on
+    # the infinite plane its translations) share one entry, their lifetime
+    # is the same under every life-like rule
+    if max_size <= 0:
+        return None
+    if canonical:
+        return FitnessCache(max_size, key_function=partial(canonical_key, boundary=boundary))
+    return FitnessCache(max_size)
 
-    
-    best_individual = None
-    best_fitness = -1
-    fitness_history = []
-    for generation in range(ga_num_generations):
-        print(f" Generation {generation + 1}/{ga_num_generations} ")
-        fitnesses = []
-        for i, individual in enumerate(population):
-            fitness = calculate_fitness(individual, ga_simulation_steps)
-            fitnesses.append(fitness)
-        current_best_fitness_index = np.argmax(fitnesses)
-        current_best_fitness = fitnesses[current_best_fitness_index]
-        current_best_individual = population[current_best_fitness_index]
+def replace_duplicates(population, width, height, boundary, rng):
+    # boards that are symmetric copies of an earlier board are replaced in
+    # place by random boards. returns how many were replaced
+    duplicates = np.flatnonzero(duplicate_mask(population, boundary))
+    for index in duplicates:
+        population[index] = random_state(width, height, rng)
+    return len(duplicates)
+
+def evolve_patterns(population_size=ga_population_size, num_generations=ga_num_generations,
+                    mutation_rate=ga_mutation_rate, simulation_steps=ga_simulation_steps,
+                    board_width=ga_board_width, board_height=ga_board_height,
+                    fitness_threshold=ga_fitness_threshold, crossover_rate=ga_crossover_rate,
+                    tournament_size=ga_tournament_size, selection=ga_selection, cycle_detection=ga_cycle_detection,
+                    engine=ga_engine, boundary=ga_boundary, rule=ga_rule, seed=ga_seed, rng=None, num_workers=ga_num_workers, fitness_cache_size=ga_fitness_cache_size,
+                    trajectory_cache_size=ga_trajectory_cache_size, trajectory_cache_path=ga_trajectory_cache_path,
+                    checkpoint_path=ga_checkpoint_path, checkpoint_interval=ga_checkpoint_interval, resume_from=None,
+                    metrics_path=ga_metrics_path, population_store_path=ga_population_store_path,
+                    profile=ga_profile, profile_path=ga_profile_path,
+                    profile_window=ga_profile_window, tracemalloc_window=ga_tracemalloc_window, instrumentation=None,
+                    canonical_cache=ga_canonical_cache, deduplicate=ga_deduplicate, verbose=True):
+    # profile=True (or an Instrumentation passed in) times the phases of every
+    # generation and counts the simulation work, see profiling.py. the totals
+    # go to profile_path as JSON and the per-generation values into the metrics
+    rng = rng if rng is not None else make_rng(seed)
+    rule = normalize_rule(rule)
+    settings = dict(population_size=population_size, num_generations=num_generations, mutation_rate=mutation_rate,
+                    simulation_steps=simulation_steps, board_width=board_width, board_height=board_height,
+                    fitness_threshold=fitness_threshold, crossover_rate=crossover_rate,
+                    tournament_size=tournament_size, selection=selection, cycle_detection=cycle_detection,
+                    engine=engine, boundary=boundary, rule=rule, deduplicate=deduplicate, seed=seed)
+    start_generation = 0
+    checkpoint = None
+    if resume_from is not None:
+        checkpoint = load_checkpoint(resume_from)
+        check_resume_settings(checkpoint["settings"], settings)
+    if checkpoint_interval < 1:
+        raise ValueError(f"Checkpoint interval must be at least 1, got {checkpoint_interval}")
+    # the population and its offspring live in two preallocated buffers
+    store = PopulationStore(population_size, board_height, board_width, population_store_path)
+    if checkpoint is not None:
+        store.current[:] = checkpoint["population"]
+        best_individual = checkpoint["best_individual"]
+        best_fitness = checkpoint["best_fitness"]
+        fitness_history = checkpoint["fitness_history"]
+        start_generation = checkpoint["generation"]
+        restore_rng(rng, checkpoint["rng_state"])
+        if verbose:
+            print(f"Resuming from {resume_from} at generation {start_generation + 1}")
+    else:
+        #population = create_initial_population(pop_size, board_width, board_height)
+        for index in range(population_size):
+            store.current[index] = random_state(board_width, board_height, rng)
+
+        best_individual = None
+        best_fitness = -1
+        fitness_history = []
+    fitness_cache = make_fitness_cache(fitness_cache_size, boundary, canonical_cache)
+    trajectory_cache = None
+    if trajectory_cache_size > 0 and boundary != "infinite":
+        if trajectory_cache_path and os.path.exists(trajectory_cache_path):
+            trajectory_cache = TrajectoryCache.load(trajectory_cache_path, trajectory_cache_size)
+        # a saved cache simulated under another boundary or rule is of no use here
+        if trajectory_cache is None or (trajectory_cache.boundary, trajectory_cache.rule) != (boundary, rule):
+            trajectory_cache = TrajectoryCache(trajectory_cache_size, boundary=boundary, rule=rule)
+    executor = None
+    if num_workers > 1:
+        executor = ProcessPoolExecutor(max_workers=num_workers)
+    if instrumentation is None and (profile or profile_path):
+        profile_stats_path = os.path.splitext(profile_path)[0] + ".prof" if profile_path else None
+        instrumentation = Instrumentation(profile_window, tracemalloc_window, profile_stats_path)
+    # a resumed run keeps appending to the metrics of the interrupted one
+    metrics_fields = METRIC_FIELDS + PROFILE_FIELDS if instrumentation is not None else METRIC_FIELDS
+    metrics_writer = None
+    if metrics_path:
+        metrics_writer = MetricsWriter(metrics_path, append=resume_from is not None, fields=metrics_fields,
+                                       last_generation=start_generation)
+    generation = start_generation - 1
+    try:
+        for generation in range(start_generation, num_generations):
+            if verbose:
+                print(f" Generation {generation + 1}/{num_generations} ")
+            if instrumentation is not None:
+                instrumentation.start_generation(generation + 1)
+            population = store.current
+            evaluation_start = time.perf_counter()
+            cache_lookups = (fitness_cache.hits, fitness_cache.misses) if fitness_cache is not None else None
+            evaluation_options = dict(cycle_detection=cycle_detection, executor=executor, num_chunks=num_workers * 4,
+                                      cache=fitness_cache, trajectory_cache=trajectory_cache, engine=engine,
+                                      boundary=boundary, rule=rule, instrumentation=instrumentation)
+            with phase(instrumentation, "evaluation"):
+                fitnesses = evaluate_population(population, simulation_steps, **evaluation_options)
+            evaluation_seconds = time.perf_counter() - evaluation_start
+            cache_hit_rate = None
+            if cache_lookups is not None:
+                hits = fitness_cache.hits - cache_lookups[0]
+                misses = fitness_cache.misses - cache_lookups[1]
+                cache_hit_rate = hits / max(hits + misses, 1)
+                if instrumentation is not None:
+                    instrumentation.count("cache_hits", hits)
+                    instrumentation.count("cache_misses", misses)
+            # the row is written once the generation is over, so its phase
+            # times include the breeding and checkpoint of this generation
+            metrics_row = None
+            if metrics_writer is not None:
+                with phase(instrumentation, "metrics"):
+                    metrics_row = generation_metrics(generation + 1, population, fitnesses, evaluation_seconds,
+                                                     cache_hit_rate, boundary)
+            current_best_fitness_index = np.argmax(fitnesses)
+            current_best_fitness = fitnesses[current_best_fitness_index]
+            current_best_individual = population[current_best_fitness_index]
         
-        if current_best_fitness > best_fitness:
-            best_fitness = current_best_fitness
-            best_individual = current_best_individual.copy()
+            if current_best_fitness > best_fitness:
+                best_fitness = current_best_fitness
+                best_individual = current_best_individual.astype(int)
         
-        fitness_history.append(current_best_fitness)
-        if best_fitness >= ga_fitness_threshold:
-            break
+            fitness_history.append(current_best_fitness)
+            finished = best_fitness >= fitness_threshold
         
-        next_population = []
-        next_population.append(current_best_individual.copy())
-        number_to_generate = ga_population_size -1 #the elite already takes one spot
-        for _ in range(number_to_generate // 2):
-            parent1 = select_parents(population, fitnesses, ga_tournament_size)
-            parent2 = select_parents(population, fitnesses, ga_tournament_size)
-            
-            if random.random() < ga_crossover_rate:
-                child1, child2 = crossover(parent1, parent2)
-            else:
-                child1, child2 = parent1.copy(), parent2.copy()
-                
-            mutated_child1 = mutation(child1, ga_mutation_rate)
-            mutated_child2 = mutation(child2, ga_mutation_rate)
-            
-            next_population.append(mutated_child1)
-            next_population.append(mutated_child2)
-            
-        while len(next_population) < ga_population_size:
-            next_population.append(best_individual.copy())
-            
-        next_population = next_population[:ga_population_size]
-            
-        population = next_population
+            if not finished:
+                breed_population(population, fitnesses, best_individual, population_size, crossover_rate,
+                                 mutation_rate, tournament_size, rng, out=store.next, selection=selection,
+                                 instrumentation=instrumentation)
+                if deduplicate:
+                    with phase(instrumentation, "deduplicate"):
+                        num_replaced = replace_duplicates(store.next, board_width, board_height, boundary, rng)
+                    if instrumentation is not None:
+                        instrumentation.count("duplicates_replaced", num_replaced)
+                store.swap()
+                if checkpoint_path and (generation + 1) % checkpoint_interval == 0:
+                    with phase(instrumentation, "checkpoint"):
+                        save_checkpoint(checkpoint_path, store.current, fitnesses, best_individual, best_fitness,
+                                        fitness_history, generation + 1, rng, settings)
 
-        print("-" * (40) + "\n")
-        
-    print(f"\nGA finished after {generation + 1} generations.")
-    print(f"Final best overall fitness: {best_fitness}")
+            if instrumentation is not None:
+                generation_profile = instrumentation.end_generation(generation + 1)
+                if metrics_row is not None:
+                    metrics_row.update(generation_profile)
+            if metrics_row is not None:
+                metrics_writer.write(metrics_row)
+            if finished:
+                break
+
+            if verbose:
+                print("-" * (40) + "\n")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if metrics_writer is not None:
+            metrics_writer.close()
+        if trajectory_cache is not None and trajectory_cache_path:
+            trajectory_cache.save(trajectory_cache_path)
+        store.close()
+        if instrumentation is not None:
+            instrumentation.close()
+            if profile_path:
+                instrumentation.save_summary(profile_path)
+
+    if verbose:
+        print(f"\nGA finished after {generation + 1} generations.")
+        print(f"Final best overall fitness: {best_fitness}")
+    if verbose and fitness_cache is not None:
+        print(f"Fitness cache: {fitness_cache.hits} hits, {fitness_cache.misses} misses ({fitness_cache.hit_rate:.1%} hit rate)")
+    if verbose and instrumentation is not None:
+        for name, seconds in instrumentation.phase_seconds.items():
+            print(f"{name:>12}: {seconds:.3f} s")
     return best_individual, fitness_history
     
\ No newline at end of file
@@ -2,6 +2,8 @@ import numpy as np
 import random
 import time 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 def dead_state(width, height):
     board = np.zeros((height,width), dtype=int)
@@ -12,8 +14,18 @@ def dead_state(width, height):
     """
     return board
 
-def random_state(width,height):
-    cell_state = np.random.randint(0, 2, size= (height, width), dtype =int)
+def make_rng(seed=None):
+    # every random draw in the engine and the GA goes through one of these,
+    # so a run is reproducible from its seed alone
+    return np.random.default_rng(seed)
+
+def spawn_rngs(rng, count):
+    # independent child streams, e.g. one per worker or island
+    return rng.spawn(count)
+
+def random_state(width,height, rng=None):
+    rng = rng if rng is not None else make_rng()
+    cell_state = rng.integers(0, 2, size= (height, width), dtype =int)
     """
     for y in range(height):
         for x in range(width):
@@ -47,7 +59,7 @@ def get_board_dimensions (board):
     width = board.shape[1]
     return height, width
 
-def next_board_state(initial_state):
+def next_board_state_loop(initial_state):
     height, width = get_board_dimensions(initial_state)
     
     new_state = dead_state(width, height)
@@ -84,6 +96,197 @@ def next_board_state(initial_state):
                 else:
                     new_state[y, x] = 0
     return new_state
+
+# Life-like rules are written as rulestrings, "B3/S23" for Conway's Life or
+# "B36/S23" for HighLife: a dead cell is born with any neighbor count listed
+# after B and a live cell survives with any count listed after S. A rule is
+# compiled once into a 2x9 table indexed by [alive, live_neighbors], so a
+# step is a single gather whatever the rule.
+
+DEFAULT_RULE = "B3/S23"
+
+@lru_cache(maxsize=None)
+def parse_rule(rulestring):
+    # returns (births, survivals) as sorted tuples of neighbor counts.
+    # accepts either order and any case, e.g. "s23/b3"
+    births = survivals = None
+    for part in rulestring.strip().upper().split("/"):
+        if not part or part[0] not in "BS" or not all(char in "012345678" for char in part[1:]):
+            raise ValueError(f"Invalid rulestring: {rulestring!r}, expected e.g. 'B3/S23'")
+        counts = tuple(sorted(set(int(char) for char in part[1:])))
+        if part[0] == "B" and births is None:
+            births = counts
+        elif part[0] == "S" and survivals is None:
+            survivals = counts
+        else:
+            raise ValueError(f"Invalid rulestring: {rulestring!r}, expected e.g. 'B3/S23'")
+    if births is None or survivals is None:
+        raise ValueError(f"Invalid rulestring: {rulestring!r}, expected e.g. 'B3/S23'")
+    return births, survivals
+
+def normalize_rule(rulestring):
+    births, survivals = parse_rule(rulestring)
+    return "B" + "".join(map(str, births)) + "/S" + "".join(map(str, survivals))
+
+@lru_cache(maxsize=None)
+def compile_rule(rulestring):
+    # flat (2 * 9) lookup table, the next state is table[9 * alive + live_neighbors]
+    births, survivals = parse_rule(rulestring)
+    table = np.zeros((2, 9), dtype=np.uint8)
+    table[0, list(births)] = 1
+    table[1, list(survivals)] = 1
+    table = table.ravel()
+    table.flags.writeable = False
+    return table
+
+def apply_rule(alive, live_neighbors, rule=DEFAULT_RULE):
+    # alive is a boolean array, live_neighbors the matching uint8 counts.
+    # Conway's table is two comparisons, which numpy evaluates about twice
+    # as fast as the gather, so it keeps that form
+    if rule == DEFAULT_RULE or normalize_rule(rule) == DEFAULT_RULE:
+        new_state = (live_neighbors == 3) | (alive & (live_neighbors == 2))
+    else:
+        new_state = compile_rule(rule).take(live_neighbors + np.uint8(9) * alive)
+    return new_state.astype(int)
+
+BOUNDARIES = ("dead", "torus", "infinite")
+
+def _check_boundary(boundary, allowed=BOUNDARIES):
+    if boundary not in allowed:
+        raise ValueError(f"Unsupported boundary: {boundary!r}, expected one of {allowed}")
+
+def count_live_neighbors(board_state, boundary="dead"):
+    # pad with a ring of dead cells so the border behaves exactly like the
+    # bounds check in next_board_state_loop, or with the opposite edges for a
+    # torus. works on a single (H, W) board or on a stack shaped (N, H, W)
+    _check_boundary(boundary, ("dead", "torus"))
+    height, width = board_state.shape[-2:]
+    if boundary == "torus":
+        pad_width = [(0, 0)] * (board_state.ndim - 2) + [(1, 1), (1, 1)]
+        padded = np.pad((board_state == 1).astype(np.uint8), pad_width, mode="wrap")
+    else:
+        padded = np.zeros(board_state.shape[:-2] + (height + 2, width + 2), dtype=np.uint8)
+        padded[..., 1:-1, 1:-1] = board_state == 1
+
+    neighbors = np.zeros(board_state.shape, dtype=np.uint8)
+    for dy in range(3):
+        for dx in range(3):
+            if dy == 1 and dx == 1:
+                continue
+            neighbors += padded[..., dy:dy + height, dx:dx + width]
+    return neighbors
+
+def _grow_to_fit(board_state):
+    # adds a ring of dead cells on every side a live cell touches, so one
+    # dead-border step is exactly one step of the unbounded plane
+    alive = board_state == 1
+    pad_top, pad_bottom = int(alive[0].any()), int(alive[-1].any())
+    pad_left, pad_right = int(alive[:, 0].any()), int(alive[:, -1].any())
+    if pad_top or pad_bottom or pad_left or pad_right:
+        board_state = np.pad(board_state, ((pad_top, pad_bottom), (pad_left, pad_right)))
+    return board_state
+
+def _check_unbounded_rule(rule):
+    # on the unbounded plane a B0 rule would switch on infinitely many cells
+    if 0 in parse_rule(rule)[0]:
+        raise ValueError(f"Rule {rule!r} has B0, which the infinite boundary cannot represent")
+
+def next_board_state(initial_state, boundary="dead", rule=DEFAULT_RULE):
+    # boundary "dead" treats everything off the board as dead, "torus" wraps
+    # the edges and "infinite" grows the board wherever a pattern reaches the
+    # edge (see next_cells_state for the sparse form of the unbounded plane)
+    _check_boundary(boundary)
+    if boundary == "infinite":
+        if initial_state.ndim != 2:
+            raise ValueError("The infinite boundary steps one board at a time, since boards grow independently")
+        _check_unbounded_rule(rule)
+        initial_state = _grow_to_fit(initial_state)
+        boundary = "dead"
+    live_neighbors = count_live_neighbors(initial_state, boundary)
+    return apply_rule(initial_state == 1, live_neighbors, rule)
+
+# The unbounded plane as a sparse set of live cells: a sorted int64 array of
+# keys y * 2**32 + x. Neighbor keys are plain additions, so a step is a single
+# np.unique over the neighbors of the live cells and costs O(population).
+
+CELL_KEY_SHIFT = 1 << 32
+NEIGHBOR_KEY_OFFSETS = np.array([dy * CELL_KEY_SHIFT + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx],
+                                dtype=np.int64)
+
+def board_to_cells(board_state, origin=(0, 0)):
+    ys, xs = np.nonzero(board_state == 1)
+    return np.sort((ys.astype(np.int64) + origin[0]) * CELL_KEY_SHIFT + xs + origin[1])
+
+def cells_to_board(cells):
+    # returns the bounding box of the live cells and its top-left corner
+    if len(cells) == 0:
+        return dead_state(0, 0), (0, 0)
+    ys = (cells + CELL_KEY_SHIFT // 2) // CELL_KEY_SHIFT
+    xs = cells - ys * CELL_KEY_SHIFT
+    top, left = int(ys.min()), int(xs.min())
+    board = dead_state(int(xs.max()) - left + 1, int(ys.max()) - top + 1)
+    board[ys - top, xs - left] = 1
+    return board, (top, left)
+
+def next_cells_state(cells, rule=DEFAULT_RULE):
+    # only cells next to a live cell are candidates, which is exact for any
+    # rule without B0
+    _check_unbounded_rule(rule)
+    neighbor_keys = (cells[:, None] + NEIGHBOR_KEY_OFFSETS[None, :]).ravel()
+    candidates, live_neighbors = np.unique(neighbor_keys, return_counts=True)
+    alive = np.isin(candidates, cells, assume_unique=True)
+    return candidates[apply_rule(alive, live_neighbors.astype(np.uint8), rule) == 1]
+
+def _band_rows(height, first_row, last_row, boundary):
+    # the rows a band needs: its own rows plus one halo row on each side. on a
+    # dead border the top and bottom bands get no halo row past the edge,
+    # on a torus the halo rows wrap around
+    if boundary == "torus":
+        return np.arange(first_row - 1, last_row + 1) % height, 1
+    halo_top = max(first_row - 1, 0)
+    halo_bottom = min(last_row + 1, height)
+    return np.arange(halo_top, halo_bottom), first_row - halo_top
+
+def _step_band(initial_state, new_state, first_row, last_row, boundary, rule):
+    rows, first_own_row = _band_rows(initial_state.shape[0], first_row, last_row, boundary)
+    band = next_board_state(initial_state[rows], boundary, rule)
+    new_state[first_row:last_row] = band[first_own_row:first_own_row + last_row - first_row]
+
+def next_board_state_tiled(initial_state, num_threads=None, executor=None, boundary="dead", rule=DEFAULT_RULE):
+    # same result as next_board_state, with the board split into row bands
+    # that are stepped on a thread pool. the numpy kernels release the GIL,
+    # so threads are enough. pass an executor to reuse threads across steps
+    _check_boundary(boundary, ("dead", "torus"))
+    height = initial_state.shape[0]
+    num_threads = num_threads or os.cpu_count() or 1
+    num_bands = min(num_threads, height)
+    if num_bands <= 1:
+        return next_board_state(initial_state, boundary, rule)
+
+    new_state = np.empty(initial_state.shape, dtype=int)
+    band_edges = np.linspace(0, height, num_bands + 1).astype(int)
+    bands = list(zip(band_edges[:-1], band_edges[1:]))
+    step_band = lambda band: _step_band(initial_state, new_state, *band, boundary, rule)
+
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=num_bands) as band_executor:
+            list(band_executor.map(step_band, bands))
+    else:
+        list(executor.map(step_band, bands))
+    return new_state
+
+def next_board_states(boards, live_mask=None, boundary="dead", rule=DEFAULT_RULE):
+    # advances a whole (N, H, W) stack of boards one generation in one call.
+    # boards whose live_mask entry is False are copied through unchanged
+    _check_boundary(boundary, ("dead", "torus"))
+    if live_mask is None:
+        return next_board_state(boards, boundary, rule)
+
+    new_boards = boards.astype(int, copy=True)
+    live_mask = np.asarray(live_mask, dtype=bool)
+    if live_mask.any():
+        new_boards[live_mask] = next_board_state(boards[live_mask], boundary, rule)
+    return new_boards
                 
 if __name__ == "__main__":
     print("Starting Game of Life simulation...")
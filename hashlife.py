@@ -0,0 +1,272 @@
+import numpy as np
+from game_of_life import DEFAULT_RULE, compile_rule, parse_rule
+
+# HashLife on a bounded board. Cells are DEAD, ALIVE or WALL. Everything
+# outside the board is WALL: wall cells never change and count as dead
+# neighbors, which is exactly the dead border of next_board_state, while the
+# rule stays translation invariant so quadtree nodes can be shared and their
+# futures memoized as usual.
+
+DEAD, ALIVE, WALL = 0, 1, 2
+
+class Node:
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population", "cell")
+
+    def __init__(self, level, nw=None, ne=None, sw=None, se=None, population=0, cell=None):
+        self.level = level
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.population = population
+        self.cell = cell
+
+class HashLife:
+    # owns the node table and the result memo. nodes are interned, so two
+    # equal boards are the same Node object and comparing states is `is`
+    def __init__(self, max_nodes=None, rule=DEFAULT_RULE):
+        if 0 in parse_rule(rule)[0]:
+            # death is searched for as a state that stays empty
+            raise ValueError(f"Rule {rule!r} has B0, which HashLife does not support")
+        self.max_nodes = max_nodes if max_nodes is not None else DEFAULT_MAX_NODES
+        self.rule = rule
+        self._rule_table = compile_rule(rule)
+        self._nodes = {}
+        self._results = {}
+        self.leaves = tuple(Node(0, population=int(cell == ALIVE), cell=cell) for cell in (DEAD, ALIVE, WALL))
+        self._walls = [self.leaves[WALL]]
+
+    def join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.level + 1, nw, ne, sw, se,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def wall(self, level):
+        while len(self._walls) <= level:
+            smaller = self._walls[-1]
+            self._walls.append(self.join(smaller, smaller, smaller, smaller))
+        return self._walls[level]
+
+    def clear(self):
+        self._nodes.clear()
+        self._results.clear()
+        self._walls = [self.leaves[WALL]]
+
+    def __len__(self):
+        return len(self._nodes)
+
+    # --- conversions --------------------------------------------------------
+
+    def from_board(self, board):
+        # the board sits at the top-left of the centre half of a wall-filled
+        # root, which is all a step of the root can see
+        height, width = board.shape
+        level = 2
+        while (1 << (level - 1)) < max(height, width):
+            level += 1
+        size = 1 << level
+        offset = size >> 2
+
+        cells = np.full((size, size), WALL, dtype=np.int8)
+        cells[offset:offset + height, offset:offset + width] = board == 1
+        return self._build(cells, 0, 0, level), (height, width)
+
+    def _build(self, cells, y, x, level):
+        if level == 0:
+            return self.leaves[cells[y, x]]
+        block = cells[y:y + (1 << level), x:x + (1 << level)]
+        if (block == WALL).all():
+            return self.wall(level)
+        half = 1 << (level - 1)
+        return self.join(self._build(cells, y, x, level - 1),
+                         self._build(cells, y, x + half, level - 1),
+                         self._build(cells, y + half, x, level - 1),
+                         self._build(cells, y + half, x + half, level - 1))
+
+    def to_board(self, root, shape):
+        # only the board window is filled in, so a root grown for a long jump
+        # is never materialized
+        board = np.zeros(shape, dtype=int)
+        offset = 1 << (root.level - 2)
+        self._fill(root, board, -offset, -offset)
+        return board
+
+    def _fill(self, node, board, y, x):
+        height, width = board.shape
+        size = 1 << node.level
+        if node.population == 0 or y >= height or x >= width or y + size <= 0 or x + size <= 0:
+            return
+        if node.level == 0:
+            board[y, x] = 1
+            return
+        half = size >> 1
+        self._fill(node.nw, board, y, x)
+        self._fill(node.ne, board, y, x + half)
+        self._fill(node.sw, board, y + half, x)
+        self._fill(node.se, board, y + half, x + half)
+
+    # --- evolution ----------------------------------------------------------
+
+    def _centre(self, node):
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _horizontal_centre(self, west, east):
+        return self.join(west.ne, east.nw, west.se, east.sw)
+
+    def _vertical_centre(self, north, south):
+        return self.join(north.sw, north.se, south.nw, south.ne)
+
+    def _step_cell(self, cell, neighbors):
+        if cell.cell == WALL:
+            return cell
+        live_neighbors = sum(neighbor.cell == ALIVE for neighbor in neighbors)
+        return self.leaves[self._rule_table[9 * (cell.cell == ALIVE) + live_neighbors]]
+
+    def _base_step(self, node):
+        # a 4x4 node advanced one generation gives its 2x2 centre
+        grid = [[None] * 4 for _ in range(4)]
+        for quadrant, (y, x) in ((node.nw, (0, 0)), (node.ne, (0, 2)), (node.sw, (2, 0)), (node.se, (2, 2))):
+            grid[y][x], grid[y][x + 1] = quadrant.nw, quadrant.ne
+            grid[y + 1][x], grid[y + 1][x + 1] = quadrant.sw, quadrant.se
+
+        def next_cell(y, x):
+            neighbors = [grid[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+            return self._step_cell(grid[y][x], neighbors)
+
+        return self.join(next_cell(1, 1), next_cell(1, 2), next_cell(2, 1), next_cell(2, 2))
+
+    def step(self, node, log_generations):
+        # centre half of node advanced 2**log_generations generations, where
+        # log_generations <= node.level - 2
+        key = (node, log_generations)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node is self.wall(node.level):
+            result = self.wall(node.level - 1)
+        elif node.level == 2:
+            result = self._base_step(node)
+        else:
+            # at full speed both halves of the jump are full-speed steps one
+            # level down, otherwise the first half is a plain re-centring
+            full_speed = log_generations == node.level - 2
+            sub_log = log_generations - 1 if full_speed else log_generations
+            advance = (lambda sub: self.step(sub, sub_log)) if full_speed else self._centre
+            n00 = advance(node.nw)
+            n01 = advance(self._horizontal_centre(node.nw, node.ne))
+            n02 = advance(node.ne)
+            n10 = advance(self._vertical_centre(node.nw, node.sw))
+            n11 = advance(self._centre(node))
+            n12 = advance(self._vertical_centre(node.ne, node.se))
+            n20 = advance(node.sw)
+            n21 = advance(self._horizontal_centre(node.sw, node.se))
+            n22 = advance(node.se)
+            result = self.join(self.step(self.join(n00, n01, n10, n11), sub_log),
+                               self.step(self.join(n01, n02, n11, n12), sub_log),
+                               self.step(self.join(n10, n11, n20, n21), sub_log),
+                               self.step(self.join(n11, n12, n21, n22), sub_log))
+
+        self._results[key] = result
+        return result
+
+    def _expand(self, centre):
+        # puts a level k - 1 result back in the middle of a level k wall node
+        wall = self.wall(centre.level - 1)
+        return self.join(self.join(wall, wall, wall, centre.nw),
+                         self.join(wall, wall, centre.ne, wall),
+                         self.join(wall, centre.sw, wall, wall),
+                         self.join(centre.se, wall, wall, wall))
+
+    def grow(self, root):
+        # same board one level up: the board stays at the top-left of the
+        # centre half, everything new is wall
+        wall = self.wall(root.level - 1)
+        return self._expand(self.join(self._centre(root), wall, wall, wall))
+
+    def advance(self, root, generations):
+        # jumps any number of generations as a sum of power-of-two steps. the
+        # root is grown first so the largest jump is a single step of it
+        while root.level - 2 < generations.bit_length() - 1:
+            root = self.grow(root)
+        log_generations = 0
+        while generations:
+            if generations & 1:
+                root = self._expand(self.step(root, log_generations))
+            generations >>= 1
+            log_generations += 1
+        return root
+
+# most cycles have a short period, so the lcm of 1..12 is tried as one jump
+# before searching for the period generation by generation
+COMMON_PERIODS_MULTIPLE = 27720
+DEFAULT_MAX_NODES = 2000000
+
+def _prime_factors(number):
+    factors = []
+    factor = 2
+    while factor * factor <= number:
+        while number % factor == 0:
+            factors.append(factor)
+            number //= factor
+        factor += 1
+    if number > 1:
+        factors.append(number)
+    return factors
+
+def _find_period(universe, state, num_simulation_steps):
+    # smallest period of state, or None if state does not come back within
+    # the horizon (it is not on a cycle yet, or the cycle is too long)
+    if universe.advance(state, COMMON_PERIODS_MULTIPLE) is state:
+        period = COMMON_PERIODS_MULTIPLE
+        for factor in _prime_factors(COMMON_PERIODS_MULTIPLE):
+            if universe.advance(state, period // factor) is state:
+                period //= factor
+        return period
+
+    current = state
+    for period in range(1, num_simulation_steps + 1):
+        current = universe.advance(current, 1)
+        if current is state:
+            return period
+    return None
+
+def _first_generation(low, high, predicate):
+    # smallest generation in [low, high] where a monotone predicate holds
+    while low < high:
+        middle = (low + high) // 2
+        if predicate(middle):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+def hashlife_fitness(board, num_simulation_steps, universe=None, rule=DEFAULT_RULE):
+    # same result as calculate_fitness, found with jumps instead of stepping
+    # every generation: the state at the horizon tells whether the board died
+    # (then the death generation is binary searched) or sits on a cycle (then
+    # the period is found from there and the tail length is binary searched).
+    # lifetimes of 10**5 generations and beyond cost a few dozen jumps
+    # a universe passed in brings its own rule
+    universe = universe if universe is not None else HashLife(rule=rule)
+    if len(universe) > universe.max_nodes:
+        universe.clear()
+    root, _ = universe.from_board(board)
+    # grown once up front so every state has the same level and equal
+    # boards really are the same node
+    longest_jump = 2 * num_simulation_steps + COMMON_PERIODS_MULTIPLE
+    while root.level - 2 < longest_jump.bit_length():
+        root = universe.grow(root)
+    state_at = lambda generation: universe.advance(root, generation)
+
+    final_state = state_at(num_simulation_steps)
+    if final_state.population == 0:
+        return _first_generation(1, num_simulation_steps, lambda generation: state_at(generation).population == 0)
+
+    period = _find_period(universe, final_state, num_simulation_steps)
+    if period is None:
+        return num_simulation_steps
+    tail_length = _first_generation(0, num_simulation_steps,
+                                    lambda generation: universe.advance(state_at(generation), period) is state_at(generation))
+    return min(tail_length + period, num_simulation_steps)
@@ -0,0 +1,167 @@
+import multiprocessing
+import queue
+import numpy as np
+from game_of_life import make_rng, spawn_rngs, normalize_rule
+from bitboard import pack_board, unpack_board
+from ga_solver import create_initial_population, evaluate_population, breed_population, make_fitness_cache
+from ga_parameters import *
+
+# Island model: each island is a sub-population evolving in its own process.
+# Every migration_interval generations an island sends copies of its best
+# individuals to the next island on a ring and takes in whatever migrants
+# have already arrived, replacing its worst individuals. Nobody waits for
+# migrants, so islands never synchronize on a global fitness barrier.
+
+ISLAND_POLL_SECONDS = 1.0
+
+class QueueTransport:
+    # local stand-in for a network transport: one inbox queue per island.
+    # migrants travel bit-packed, together with their fitness so the
+    # receiving island does not simulate them again
+    def __init__(self, num_islands, context=None):
+        context = context if context is not None else multiprocessing.get_context()
+        self.inboxes = [context.Queue() for _ in range(num_islands)]
+
+    def send(self, island, individuals, fitnesses):
+        boards = np.array(individuals)
+        self.inboxes[island].put((pack_board(boards).tobytes(), boards.shape, list(fitnesses)))
+
+    def receive(self, island):
+        # every migrant that has arrived so far, without blocking
+        individuals, fitnesses = [], []
+        while True:
+            try:
+                packed_bytes, shape, migrant_fitnesses = self.inboxes[island].get_nowait()
+            except queue.Empty:
+                break
+            num_boards, board_height, board_width = shape
+            packed = np.frombuffer(packed_bytes, dtype=np.uint64).reshape(num_boards, board_height, -1)
+            individuals.extend(unpack_board(packed, board_width))
+            fitnesses.extend(migrant_fitnesses)
+        return individuals, fitnesses
+
+    def close(self):
+        # migrants still in flight when an island stops are dropped, so a
+        # finished process never blocks on flushing a queue nobody reads
+        for inbox in self.inboxes:
+            inbox.cancel_join_thread()
+
+def migrate(population, fitnesses, island, num_islands, transport, migration_size):
+    # sends the best migration_size individuals to the next island and puts
+    # the received migrants in place of the worst individuals
+    ranking = np.argsort(fitnesses, kind="stable")
+    emigrants = ranking[::-1][:migration_size]
+    transport.send((island + 1) % num_islands, [population[index] for index in emigrants],
+                   [fitnesses[index] for index in emigrants])
+
+    immigrants, immigrant_fitnesses = transport.receive(island)
+    population, fitnesses = list(population), list(fitnesses)
+    for index, immigrant, fitness in zip(ranking, immigrants[-len(population):], immigrant_fitnesses[-len(population):]):
+        population[index] = immigrant
+        fitnesses[index] = fitness
+    return population, fitnesses
+
+def run_island(island, num_islands, transport, rng, settings):
+    population = create_initial_population(settings["population_size"], settings["board_width"],
+                                           settings["board_height"], rng)
+    fitness_cache = make_fitness_cache(settings["fitness_cache_size"], settings["boundary"])
+    best_individual = None
+    best_fitness = -1
+    fitness_history = []
+
+    for generation in range(settings["num_generations"]):
+        fitnesses = evaluate_population(population, settings["simulation_steps"], settings["cycle_detection"],
+                                        cache=fitness_cache, engine=settings["engine"],
+                                        boundary=settings["boundary"], rule=settings["rule"])
+        if num_islands > 1 and (generation + 1) % settings["migration_interval"] == 0:
+            population, fitnesses = migrate(population, fitnesses, island, num_islands, transport,
+                                            settings["migration_size"])
+
+        current_best_fitness_index = int(np.argmax(fitnesses))
+        if fitnesses[current_best_fitness_index] > best_fitness:
+            best_fitness = fitnesses[current_best_fitness_index]
+            best_individual = population[current_best_fitness_index].copy()
+        fitness_history.append(fitnesses[current_best_fitness_index])
+        if best_fitness >= settings["fitness_threshold"]:
+            break
+
+        population = breed_population(population, fitnesses, best_individual, settings["population_size"],
+                                      settings["crossover_rate"], settings["mutation_rate"],
+                                      settings["tournament_size"], rng, selection=settings["selection"])
+    return best_individual, best_fitness, fitness_history
+
+def _island_process(island, num_islands, transport, rng, settings, results):
+    try:
+        results.put((island, run_island(island, num_islands, transport, rng, settings), None))
+    except Exception as e:
+        results.put((island, None, repr(e)))
+    finally:
+        transport.close()
+
+def _collect_results(processes, results, poll_seconds=ISLAND_POLL_SECONDS):
+    # one (best_individual, best_fitness, history) per island. results are
+    # collected before joining, a process cannot exit while its result is
+    # still sitting in the queue. an island that exited without posting one
+    # (killed, crashed in native code) is only reported after one more poll,
+    # since a result posted right before exiting may still be in the pipe
+    island_results = [None] * len(processes)
+    missing = set(range(len(processes)))
+    exited = set()
+    while missing:
+        try:
+            island, result, error = results.get(timeout=poll_seconds)
+        except queue.Empty:
+            for island in sorted(missing & exited):
+                raise RuntimeError(f"Island {island} exited with code {processes[island].exitcode} without a result")
+            exited = {island for island in missing if processes[island].exitcode is not None}
+            continue
+        if error is not None:
+            raise RuntimeError(f"Island {island} failed: {error}")
+        island_results[island] = result
+        missing.discard(island)
+    return island_results
+
+def evolve_islands(num_islands=ga_num_islands, migration_interval=ga_migration_interval,
+                   migration_size=ga_migration_size, population_size=ga_population_size,
+                   num_generations=ga_num_generations, mutation_rate=ga_mutation_rate,
+                   simulation_steps=ga_simulation_steps, board_width=ga_board_width,
+                   board_height=ga_board_height, fitness_threshold=ga_fitness_threshold,
+                   crossover_rate=ga_crossover_rate, tournament_size=ga_tournament_size, selection=ga_selection,
+                   cycle_detection=ga_cycle_detection, engine=ga_engine, boundary=ga_boundary, rule=ga_rule,
+                   seed=ga_seed, rng=None, fitness_cache_size=ga_fitness_cache_size, verbose=True):
+    # population_size is per island. returns the best individual over all
+    # islands and one best-fitness history per island
+    if num_islands < 1 or migration_interval < 1 or not 0 <= migration_size <= population_size:
+        raise ValueError("Need at least one island, a positive migration interval and 0 <= migration size <= population size")
+    rng = rng if rng is not None else make_rng(seed)
+    settings = dict(population_size=population_size, num_generations=num_generations, mutation_rate=mutation_rate,
+                    simulation_steps=simulation_steps, board_width=board_width, board_height=board_height,
+                    fitness_threshold=fitness_threshold, crossover_rate=crossover_rate,
+                    tournament_size=tournament_size, selection=selection, cycle_detection=cycle_detection, engine=engine,
+                    boundary=boundary, rule=normalize_rule(rule), fitness_cache_size=fitness_cache_size,
+                    migration_interval=migration_interval, migration_size=migration_size)
+
+    context = multiprocessing.get_context()
+    transport = QueueTransport(num_islands, context)
+    results = context.Queue()
+    processes = [context.Process(target=_island_process,
+                                 args=(island, num_islands, transport, island_rng, settings, results))
+                 for island, island_rng in enumerate(spawn_rngs(rng, num_islands))]
+    for process in processes:
+        process.start()
+    try:
+        island_results = _collect_results(processes, results)
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    best_island = max(range(num_islands), key=lambda island: island_results[island][1])
+    best_individual, best_fitness, _ = island_results[best_island]
+    island_histories = [history for _, _, history in island_results]
+    if verbose:
+        for island, history in enumerate(island_histories):
+            print(f"Island {island}: {len(history)} generations, best fitness {max(history)}")
+        print(f"Final best overall fitness: {best_fitness} (island {best_island})")
+    return best_individual, island_histories
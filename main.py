@@ -1,19 +1,66 @@
+import argparse
 import numpy as np
-import pygame 
+import sys
 import time
-import matplotlib.pyplot as plt
 import os
+import re
 from game_of_life import *
 from ga_solver import *
 from ga_parameters import *
+from checkpoint import load_checkpoint
+from pattern_archive import save_archive, load_archive, rle_to_board
+
+# Command line entry point. pygame and matplotlib are only imported by the
+# subcommands that draw something, so `evolve` runs unattended on headless
+# machines:
+#   python main.py evolve --generations 500 --seed 1
+#   python main.py replay ga_results/evolved_pattern_<timestamp>.npz
+#   python main.py render ga_results/evolved_pattern_<timestamp>.npz --generations 50
+#   python main.py bench --sizes 20 256
 
 
 alive = "green"
 dead = "black"
 
-cell_size = 12     
+cell_size = 12
+
+DEFAULT_RESULTS_FOLDER = "ga_results"
+
+# (flag, evolve_patterns argument, type). each flag overrides the matching
+# ga_parameters value, flags left out keep the ga_parameters default
+EVOLVE_OPTIONS = [
+    ("--population-size", "population_size", int),
+    ("--generations", "num_generations", int),
+    ("--mutation-rate", "mutation_rate", float),
+    ("--simulation-steps", "simulation_steps", int),
+    ("--width", "board_width", int),
+    ("--height", "board_height", int),
+    ("--fitness-threshold", "fitness_threshold", int),
+    ("--crossover-rate", "crossover_rate", float),
+    ("--tournament-size", "tournament_size", int),
+    ("--selection", "selection", str),
+    ("--cycle-detection", "cycle_detection", str),
+    ("--engine", "engine", str),
+    ("--boundary", "boundary", str),
+    ("--rule", "rule", str),
+    ("--seed", "seed", int),
+    ("--workers", "num_workers", int),
+    ("--fitness-cache-size", "fitness_cache_size", int),
+    ("--trajectory-cache-size", "trajectory_cache_size", int),
+    ("--trajectory-cache-path", "trajectory_cache_path", str),
+    ("--profile", "profile", bool),
+    ("--profile-path", "profile_path", str),
+    ("--deduplicate", "deduplicate", bool),
+]
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def draw_board_pygame(screen, board_state, cell_size):
+    import pygame
     board_height, board_width = board_state.shape
     for y in range(board_height):
         for x in range(board_width):
@@ -22,81 +69,215 @@ def draw_board_pygame(screen, board_state, cell_size):
             y_pixel = y * cell_size
             color = alive if cell_value == 1 else dead
             pygame.draw.rect(screen, color, (x_pixel, y_pixel, cell_size, cell_size))
-            
-def plot_ga_results(history):
-    plt.plot(history)
-    plt.xlabel('Generation')
-    plt.ylabel('Best Fitness')
-    plt.title('GA Fitness over generations')
+
+def _draw_fitness_history(axes, history):
+    axes.plot(history)
+    axes.set_xlabel('Generation')
+    axes.set_ylabel('Best Fitness')
+    axes.set_title('GA Fitness over generations')
+
+def plot_ga_results(history, path=None):
+    # shows the plot in a window, or writes it to path. the file is drawn on
+    # its own Agg canvas, so it needs no display and leaves the pyplot backend
+    # alone for a window shown later in the same process
+    if path is not None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        _draw_fitness_history(figure.add_subplot(), history)
+        figure.savefig(path)
+        return
+    import matplotlib.pyplot as plt
+    _draw_fitness_history(plt.gca(), history)
     plt.show()
-    
-def save_results(pattern, history, folder="ga_results"):
-    if not os.path.exists(folder):
-        os.makedirs(folder)
-    timestamp = time.strftime("%Y%m%d-%H%M%S") 
-    pattern_filename = os.path.join(folder, f"evolved_patttern_{timestamp}.txt")
-    history_filename = os.path.join(folder, f"fitness_history_{timestamp}.csv")
-    numpy_pattern_filename = os.path.join(folder, f"evolved_pattern_{timestamp}.npy")
-    
+
+def save_results(pattern, history, folder="ga_results", metadata=None, timestamp=None):
+    # one archive per run: the pattern as RLE and bit-packed, the fitness
+    # history and the run metadata (see pattern_archive). returns the
+    # archive path, or None when it could not be written
+    timestamp = timestamp if timestamp is not None else time.strftime("%Y%m%d-%H%M%S")
+    archive_filename = os.path.join(folder, f"evolved_pattern_{timestamp}.npz")
     try:
-        np.savetxt(pattern_filename, pattern, fmt='%d')
-        np.save(numpy_pattern_filename, pattern)
-        
-        with open(history_filename, 'w') as f:
-            f.write("Generation, Best Fitness\n")
-            for i, fitness in enumerate(history):
-                f.write(f"{i+1},{fitness}\n")
-    
+        save_archive(archive_filename, pattern, history, dict(metadata or {}, timestamp=timestamp))
     except Exception as e:
-        print(f"Error when tryig to save the results: {e}")
-    
-    
-    
-if __name__ == "__main__":
-    evolved_pattern, fitness_history = evolve_patterns()
-    
-    plot_ga_results(fitness_history)
-    
-    save_results(evolved_pattern, fitness_history)
-    
-    print("\n--- Verifying Evolved Pattern for Pygame ---")
-    print(f"Type of evolved_pattern: {type(evolved_pattern)}")
-    print(f"Shape of evolved_pattern: {evolved_pattern.shape}")
-    print("Content of evolved_pattern (INITIAL state, before Pygame sim starts):")
-    render(evolved_pattern) 
-
-    actual_fitness_of_displayed_pattern = calculate_fitness(evolved_pattern, ga_simulation_steps)
-    print(f"Actual fitness of this specific pattern (as per calculate_fitness): {actual_fitness_of_displayed_pattern}")
-    print("------------------------------------------\n")
-    
+        print(f"Error when trying to save the results: {e}")
+        return None
+    return archive_filename
+
+def load_pattern(path):
+    # run archives, RLE files, and the .npy/.txt dumps of older runs
+    if path.endswith(".npz"):
+        return load_archive(path)["pattern"]
+    if path.endswith(".rle"):
+        with open(path) as f:
+            return rle_to_board(f.read())[0]
+    if path.endswith(".npy"):
+        return np.load(path).astype(int)
+    return np.loadtxt(path, dtype=int, ndmin=2)
+
+def replay_pattern(pattern, boundary=ga_boundary, rule=ga_rule, delay=0.1):
+    import pygame
     pygame.init()
 
-    board_height ,board_width = evolved_pattern.shape
+    board_height ,board_width = pattern.shape
 
     scree_width = board_width * cell_size
     screen_height = board_height * cell_size
-    
+
     screen = pygame.display.set_mode((scree_width, screen_height))
 
     pygame.display.set_caption("Conway's Game of Life Test")
-    
-    current_board_state = evolved_pattern.copy()
+
+    current_board_state = pattern.copy()
 
 
-    running = True 
+    running = True
 
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                running = False 
+                running = False
 
         screen.fill(dead)
-        draw_board_pygame(screen, current_board_state, cell_size) 
+        draw_board_pygame(screen, current_board_state, cell_size)
 
-        pygame.display.update() 
-        
-        current_board_state = next_board_state(current_board_state)
-        time.sleep(0.1)
+        pygame.display.update()
+
+        current_board_state = next_board_state(current_board_state, boundary, rule)
+        time.sleep(delay)
 
     pygame.quit()
-    print("Pygame window closed.")
\ No newline at end of file
+    print("Pygame window closed.")
+
+def run_timestamp(checkpoint_path):
+    # the timestamp in a default checkpoint name, None for any other name
+    match = re.fullmatch(r"checkpoint_(\d{8}-\d{6})\.npz", os.path.basename(checkpoint_path))
+    return match.group(1) if match else None
+
+def run_evolution(checkpoint_path=ga_checkpoint_path, checkpoint_interval=ga_checkpoint_interval, resume_from=None,
+                  metrics_path=ga_metrics_path, **overrides):
+    # a resumed run takes its settings from the checkpoint, so it continues
+    # exactly where the interrupted run stopped
+    settings = {}
+    if resume_from is not None:
+        settings = load_checkpoint(resume_from)["settings"]
+    settings.update(overrides)
+    return evolve_patterns(**settings, checkpoint_path=checkpoint_path, checkpoint_interval=checkpoint_interval,
+                           resume_from=resume_from, metrics_path=metrics_path)
+
+def command_evolve(args):
+    overrides = {name: getattr(args, name) for _, name, _ in EVOLVE_OPTIONS if getattr(args, name) is not None}
+    # the checkpoint, metrics and archive of a run share its timestamp, so a
+    # new run never overwrites the resume point of an interrupted one
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    checkpoint_path = args.checkpoint
+    if checkpoint_path is None:
+        checkpoint_path = args.resume if args.resume else os.path.join(args.output, f"checkpoint_{timestamp}.npz")
+    print(f"Checkpoints are written to {checkpoint_path}")
+    # a resumed run keeps appending to the metrics of the run it continues
+    metrics_timestamp = (run_timestamp(args.resume) if args.resume else None) or timestamp
+    metrics_path = args.metrics
+    if metrics_path is None:
+        metrics_path = os.path.join(args.output, f"metrics_{metrics_timestamp}.csv")
+    if overrides.get("profile") and "profile_path" not in overrides:
+        overrides["profile_path"] = os.path.join(args.output, "profile.json")
+    evolved_pattern, fitness_history = run_evolution(checkpoint_path, args.checkpoint_interval, args.resume,
+                                                     metrics_path=metrics_path, **overrides)
+
+    render(evolved_pattern)
+    settings = load_checkpoint(args.resume)["settings"] if args.resume else {}
+    settings.update(overrides)
+    simulation_steps = settings.get("simulation_steps", ga_simulation_steps)
+    boundary = settings.get("boundary", ga_boundary)
+    rule = normalize_rule(settings.get("rule", ga_rule))
+    actual_fitness = calculate_fitness(evolved_pattern, simulation_steps, boundary=boundary, rule=rule)
+
+    metadata = {name: settings.get(name, globals()["ga_" + name]) for _, name, _ in EVOLVE_OPTIONS}
+    metadata.update(rule=rule, fitness=int(actual_fitness), generations=len(fitness_history))
+    archive_path = save_results(evolved_pattern, fitness_history, args.output, metadata, timestamp)
+    print(f"Fitness of the evolved pattern: {actual_fitness}")
+    if archive_path is None:
+        return 1
+    print(f"Results written to {archive_path}")
+    if args.plot:
+        plot_path = os.path.join(args.output, "fitness_history.png")
+        plot_ga_results(fitness_history, plot_path)
+        print(f"Fitness plot written to {plot_path}")
+
+    if args.show:
+        plot_ga_results(fitness_history)
+        replay_pattern(evolved_pattern, boundary, rule)
+    return 0
+
+def command_replay(args):
+    replay_pattern(load_pattern(args.pattern), args.boundary, args.rule, args.delay)
+    return 0
+
+def command_render(args):
+    # terminal animation, needs no display
+    board = load_pattern(args.pattern)
+    for generation in range(args.generations + 1):
+        if args.delay:
+            os.system('cls' if os.name == 'nt' else 'clear')
+        print(f"Generation {generation}")
+        render(board)
+        if generation < args.generations:
+            board = next_board_state(board, args.boundary, args.rule)
+            time.sleep(args.delay)
+    return 0
+
+def command_bench(args):
+    import benchmark
+    return benchmark.main(args.bench_args)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Evolve long-lived Game of Life patterns with a genetic algorithm.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    evolve = subparsers.add_parser("evolve", help="run the GA unattended and save the results (the default)")
+    for flag, name, value_type in EVOLVE_OPTIONS:
+        help_text = f"overrides ga_{name} (default {globals()['ga_' + name]!r})"
+        if value_type is bool:
+            evolve.add_argument(flag, dest=name, action="store_true", default=None, help=help_text)
+        else:
+            evolve.add_argument(flag, dest=name, type=value_type, default=None, help=help_text)
+    evolve.add_argument("--output", default=DEFAULT_RESULTS_FOLDER, help="folder for the results")
+    evolve.add_argument("--resume", metavar="CHECKPOINT", help="continue the run saved in a checkpoint file")
+    evolve.add_argument("--checkpoint", metavar="PATH", default=None,
+                        help="where to write periodic checkpoints (default OUTPUT/checkpoint_<timestamp>.npz, "
+                             "or the --resume file)")
+    evolve.add_argument("--checkpoint-interval", type=positive_int, default=ga_checkpoint_interval,
+                        help="generations between checkpoints")
+    evolve.add_argument("--metrics", metavar="PATH", default=None,
+                        help="per-generation metrics, .csv or .jsonl (default OUTPUT/metrics_<timestamp>.csv)")
+    evolve.add_argument("--plot", action="store_true", help="also save the fitness plot as a PNG")
+    evolve.add_argument("--show", action="store_true", help="show the fitness plot and replay the pattern when done")
+    evolve.set_defaults(handler=command_evolve)
+
+    for name, handler, help_text in (("replay", command_replay, "animate a saved pattern in a pygame window"),
+                                     ("render", command_render, "print a saved pattern to the terminal")):
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument("pattern", help="a run archive (.npz), an RLE file, or an older .npy/.txt pattern")
+        subparser.add_argument("--boundary", default=ga_boundary, choices=BOUNDARIES)
+        subparser.add_argument("--rule", default=ga_rule)
+        subparser.add_argument("--delay", type=float, default=0.1, help="seconds between generations")
+        subparser.set_defaults(handler=handler)
+    subparsers.choices["render"].add_argument("--generations", type=int, default=0,
+                                              help="generations to step through after the initial state")
+
+    bench = subparsers.add_parser("bench", help="run benchmark.py, remaining arguments are passed on")
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER)
+    bench.set_defaults(handler=command_bench)
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # no subcommand (or only evolve flags) means evolve, as in the Docker image
+    if not argv or argv[0] not in ("evolve", "replay", "render", "bench", "-h", "--help"):
+        argv = ["evolve"] + argv
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
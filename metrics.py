@@ -0,0 +1,108 @@
+import json
+import os
+import time
+import numpy as np
+from ga_parameters import ga_metrics_flush_seconds
+from canonical import count_distinct
+
+# Per-generation metrics streamed to a CSV or JSON-lines file while the GA
+# runs. Rows are buffered in memory and written out at most every
+# flush_seconds (and on close), so the file can be tailed during a long run
+# at almost no cost per generation.
+
+METRIC_FIELDS = ["generation", "best_fitness", "mean_fitness", "median_fitness", "diversity",
+                 "distinct_patterns", "evaluation_seconds", "cache_hit_rate"]
+
+def population_diversity(population):
+    # mean pairwise Hamming distance per cell. for 0/1 boards it follows from
+    # the live fraction p of every cell: 2 * p * (1 - p) * N / (N - 1)
+    boards = np.asarray(population) == 1
+    num_boards = len(boards)
+    if num_boards < 2:
+        return 0.0
+    live_fraction = boards.mean(axis=0)
+    return float((2 * live_fraction * (1 - live_fraction)).mean() * num_boards / (num_boards - 1))
+
+def generation_metrics(generation, population, fitnesses, evaluation_seconds, cache_hit_rate=None, boundary="dead"):
+    # distinct_patterns counts boards up to rotation and reflection, see canonical.py
+    fitnesses = np.asarray(fitnesses)
+    return {
+        "generation": generation,
+        "best_fitness": int(fitnesses.max()),
+        "mean_fitness": float(fitnesses.mean()),
+        "median_fitness": float(np.median(fitnesses)),
+        "diversity": population_diversity(population),
+        "distinct_patterns": count_distinct(population, boundary),
+        "evaluation_seconds": evaluation_seconds,
+        "cache_hit_rate": cache_hit_rate,
+    }
+
+def drop_rows_after(path, last_generation):
+    # rewrites a metrics file without the rows of generations after
+    # last_generation. a run resumed from a checkpoint writes those again
+    with open(path) as f:
+        lines = f.readlines()
+    if path.endswith((".jsonl", ".json")):
+        kept = [line for line in lines if line.strip() and json.loads(line)["generation"] <= last_generation]
+    else:
+        generation_column = lines[0].strip().split(",").index("generation") if lines else 0
+        kept = lines[:1] + [line for line in lines[1:]
+                            if line.strip() and int(line.split(",")[generation_column]) <= last_generation]
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as f:
+        f.writelines(kept)
+    os.replace(temporary_path, path)
+
+class MetricsWriter:
+    # the format follows the extension: .jsonl (or .json) writes JSON lines,
+    # anything else CSV. append=True continues an existing file, e.g. when a
+    # run is resumed from a checkpoint, dropping the rows after
+    # last_generation first when it is given. fields are the CSV columns,
+    # extra keys of a row are kept in JSON lines only
+    def __init__(self, path, append=False, flush_seconds=ga_metrics_flush_seconds, fields=METRIC_FIELDS,
+                 last_generation=None):
+        self.path = path
+        self.fields = list(fields)
+        self.format = "jsonl" if path.endswith((".jsonl", ".json")) else "csv"
+        self.flush_seconds = flush_seconds
+        self._rows = []
+        self._last_flush = time.monotonic()
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        if append and last_generation is not None and os.path.exists(path):
+            drop_rows_after(path, last_generation)
+        write_header = self.format == "csv" and not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self._file = open(path, "a" if append else "w")
+        if write_header:
+            self._file.write(",".join(self.fields) + "\n")
+            self._file.flush()
+
+    def _format_row(self, row):
+        if self.format == "jsonl":
+            return json.dumps(row) + "\n"
+        return ",".join("" if row.get(field) is None else str(row[field]) for field in self.fields) + "\n"
+
+    def write(self, row):
+        self._rows.append(self._format_row(row))
+        if time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            self._file.write("".join(self._rows))
+            self._rows = []
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,115 @@
+import json
+import os
+import re
+import time
+import numpy as np
+from bitboard import pack_board, unpack_board
+from game_of_life import DEFAULT_RULE
+
+# One archive per GA run: a compressed .npz holding the evolved pattern
+# bit-packed and as standard Life RLE, the fitness history and the run's
+# metadata (parameters, seed, fitness, timestamp) as JSON. RLE is what other
+# Life programs read; the packed copy loads straight back into the engine.
+
+ARCHIVE_VERSION = 1
+RLE_LINE_LENGTH = 70
+RLE_TOKEN = re.compile(r"(\d*)([bo$!])")
+
+def board_to_rle(board, rule=DEFAULT_RULE):
+    height, width = board.shape
+    rows = []
+    for row in board == 1:
+        # trailing dead cells of a row are left out
+        live = np.flatnonzero(row)
+        row = row[:live[-1] + 1] if len(live) else row[:0]
+        # run boundaries: positions where the cell value changes
+        changes = np.flatnonzero(np.diff(row.astype(np.int8))) + 1
+        starts = np.concatenate(([0], changes)) if len(row) else changes
+        ends = np.concatenate((changes, [len(row)])) if len(row) else changes
+        rows.append([(end - start, "o" if row[start] else "b") for start, end in zip(starts, ends)])
+
+    tokens = []
+    empty_rows = 0
+    for y, runs in enumerate(rows):
+        if y > 0:
+            empty_rows += 1
+        if runs:
+            if empty_rows:
+                tokens.append(f"{empty_rows if empty_rows > 1 else ''}$")
+                empty_rows = 0
+            tokens.extend(f"{count if count > 1 else ''}{state}" for count, state in runs)
+    tokens.append("!")
+
+    lines = [f"x = {width}, y = {height}, rule = {rule}"]
+    line = ""
+    for token in tokens:
+        if len(line) + len(token) > RLE_LINE_LENGTH:
+            lines.append(line)
+            line = ""
+        line += token
+    lines.append(line)
+    return "\n".join(lines) + "\n"
+
+def rle_to_board(text):
+    # returns the board and the rule named in the header
+    header = None
+    body = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if header is None and line.startswith("x"):
+            header = dict(field.split("=") for field in line.replace(" ", "").split(","))
+            continue
+        body.append(line)
+    if header is None:
+        raise ValueError("RLE pattern has no 'x = ..., y = ...' header line")
+
+    board = np.zeros((int(header["y"]), int(header["x"])), dtype=int)
+    y = x = 0
+    body = "".join(body)
+    position = 0
+    for match in RLE_TOKEN.finditer(body):
+        if body[position:match.start()].strip():
+            raise ValueError(f"Unexpected RLE content: {body[position:match.start()]!r}")
+        position = match.end()
+        count = int(match.group(1)) if match.group(1) else 1
+        state = match.group(2)
+        if state == "!":
+            break
+        if state == "$":
+            y += count
+            x = 0
+        else:
+            if state == "o":
+                board[y, x:x + count] = 1
+            x += count
+    return board, header.get("rule", DEFAULT_RULE)
+
+def save_archive(path, pattern, fitness_history, metadata=None):
+    # written to a temporary file first, like the checkpoints
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    metadata = dict(metadata or {}, version=ARCHIVE_VERSION, height=pattern.shape[0], width=pattern.shape[1])
+    metadata.setdefault("timestamp", time.strftime("%Y%m%d-%H%M%S"))
+    rule = metadata.get("rule", DEFAULT_RULE)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        np.savez_compressed(f, pattern=pack_board(pattern), rle=np.array(board_to_rle(pattern, rule)),
+                            fitness_history=np.array(fitness_history, dtype=np.int64),
+                            metadata=np.array(json.dumps(metadata)))
+    os.replace(temporary_path, path)
+    return path
+
+def load_archive(path):
+    with np.load(path) as data:
+        metadata = json.loads(str(data["metadata"]))
+        if metadata["version"] != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version {metadata['version']} in {path}")
+        return {
+            "pattern": unpack_board(data["pattern"], metadata["width"]),
+            "rle": str(data["rle"]),
+            "fitness_history": data["fitness_history"].tolist(),
+            "metadata": metadata,
+        }
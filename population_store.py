@@ -0,0 +1,48 @@
+import os
+import numpy as np
+
+# Contiguous storage for a whole population: two (N, H, W) uint8 buffers, one
+# holding the current generation and one the offspring being bred into it.
+# Swapping them each generation means no board is ever allocated on its own.
+# With a path the buffers live in a np.memmap file, so populations larger
+# than RAM spill to disk and the OS pages them in as they are used.
+
+class PopulationStore:
+    def __init__(self, population_size, height, width, path=None):
+        self.shape = (population_size, height, width)
+        self.path = path
+        if path is None:
+            self._buffers = np.zeros((2,) + self.shape, dtype=np.uint8)
+        else:
+            folder = os.path.dirname(path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            self._buffers = np.memmap(path, dtype=np.uint8, mode="w+", shape=(2,) + self.shape)
+        self._current = 0
+
+    @property
+    def current(self):
+        return self._buffers[self._current]
+
+    @property
+    def next(self):
+        # the buffer offspring are written into, it becomes current on swap()
+        return self._buffers[1 - self._current]
+
+    def swap(self):
+        self._current = 1 - self._current
+
+    def flush(self):
+        if isinstance(self._buffers, np.memmap):
+            self._buffers.flush()
+
+    def close(self):
+        # drops the buffers and the backing file. views handed out earlier
+        # keep the mapping alive until they are garbage collected
+        self._buffers = None
+        if self.path is not None:
+            os.remove(self.path)
+            self.path = None
+
+    def __len__(self):
+        return self.shape[0]
@@ -0,0 +1,148 @@
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from ga_parameters import ga_profile_window, ga_tracemalloc_window
+
+# Optional instrumentation for evolve_patterns: named phase timers, counters
+# for the simulation work (steps, deaths, cycles, cache hits) and cProfile or
+# tracemalloc capture over a window of generations. When profiling is off the
+# GA passes None around instead of an Instrumentation, so the only cost left
+# is an `is not None` check per phase.
+
+PROFILE_PHASES = ["evaluation", "selection", "crossover", "mutation", "copy", "deduplicate", "metrics", "checkpoint"]
+PROFILE_COUNTERS = ["boards_simulated", "steps_simulated", "boards_resolved", "early_deaths", "cycles_detected",
+                    "cache_hits", "cache_misses", "duplicates_replaced"]
+# extra per-generation metric columns, see Instrumentation.generation_metrics
+PROFILE_FIELDS = [f"{name}_phase_seconds" for name in PROFILE_PHASES] + PROFILE_COUNTERS
+TRACEMALLOC_TOP = 10
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+def phase(instrumentation, name):
+    # `with phase(instrumentation, "evaluation"):` times the block, or does
+    # nothing when instrumentation is None
+    return _NULL_PHASE if instrumentation is None else _Phase(instrumentation, name)
+
+class Instrumentation:
+    # profile_window and tracemalloc_window are (first, last) generations,
+    # counted from 1 like the metrics, both ends included. cProfile stats are
+    # kept as profile_stats and written to profile_stats_path (pstats format)
+    # when the window closes
+    def __init__(self, profile_window=ga_profile_window, tracemalloc_window=ga_tracemalloc_window,
+                 profile_stats_path=None):
+        self.phase_seconds = dict.fromkeys(PROFILE_PHASES, 0.0)
+        self.phase_calls = dict.fromkeys(PROFILE_PHASES, 0)
+        self.counters = dict.fromkeys(PROFILE_COUNTERS, 0)
+        self.generations = 0
+        self.profile_window = profile_window
+        self.tracemalloc_window = tracemalloc_window
+        self.profile_stats_path = profile_stats_path
+        self.memory = None
+        self.profile_stats = None
+        self._profiler = None
+        self._tracing = False
+        self._start = time.perf_counter()
+        self._last_seconds = dict(self.phase_seconds)
+        self._last_counters = dict(self.counters)
+
+    def add_time(self, name, seconds):
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+        self.phase_calls[name] = self.phase_calls.get(name, 0) + 1
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + int(amount)
+
+    def start_generation(self, generation):
+        if self.profile_window is not None and generation == self.profile_window[0]:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if self.tracemalloc_window is not None and generation == self.tracemalloc_window[0] and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def end_generation(self, generation):
+        # returns the phase seconds and counters of the generation that just
+        # ended, see generation_metrics
+        self.generations += 1
+        if self._profiler is not None and generation >= self.profile_window[1]:
+            self._stop_profiler()
+        if self._tracing and generation >= self.tracemalloc_window[1]:
+            self._stop_tracemalloc()
+        return self.generation_metrics()
+
+    def _stop_profiler(self):
+        self._profiler.disable()
+        self.profile_stats = pstats.Stats(self._profiler)
+        if self.profile_stats_path:
+            self._profiler.dump_stats(self.profile_stats_path)
+        self._profiler = None
+
+    def _stop_tracemalloc(self):
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self._tracing = False
+        self.memory = {
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top": [{"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]],
+        }
+
+    def generation_metrics(self):
+        # phase seconds and counters since the previous call, as extra columns
+        # for the metrics stream (PROFILE_FIELDS)
+        row = {f"{name}_phase_seconds": self.phase_seconds[name] - self._last_seconds.get(name, 0.0) for name in PROFILE_PHASES}
+        row.update({name: self.counters[name] - self._last_counters.get(name, 0) for name in PROFILE_COUNTERS})
+        self._last_seconds = dict(self.phase_seconds)
+        self._last_counters = dict(self.counters)
+        return row
+
+    def close(self):
+        # a window still open when the run stops early is closed here
+        if self._profiler is not None:
+            self._stop_profiler()
+        if self._tracing:
+            self._stop_tracemalloc()
+
+    def summary(self):
+        return {
+            "generations": self.generations,
+            "total_seconds": time.perf_counter() - self._start,
+            "phases": {name: {"seconds": self.phase_seconds[name], "calls": self.phase_calls[name]}
+                       for name in self.phase_seconds},
+            "counters": dict(self.counters),
+            "memory": self.memory,
+            "profile_stats_path": self.profile_stats_path if self.profile_window is not None else None,
+        }
+
+    def save_summary(self, path):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
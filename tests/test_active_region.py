@@ -0,0 +1,49 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import next_board_state
+from active_region import ActiveRegionStepper, run_active_region
+
+def test_matches_full_stepping_on_random_boards():
+    rng = np.random.default_rng(71)
+    for shape in [(1, 1), (3, 3), (20, 20), (33, 17)]:
+        board = rng.integers(0, 2, size=shape).astype(int)
+        stepper = ActiveRegionStepper(board)
+        for _ in range(60):
+            stepper.step()
+            board = next_board_state(board)
+            assert np.array_equal(stepper.board, board)
+
+def test_sparse_activity_only_tracks_changed_neighborhoods():
+    board = np.zeros((200, 200), dtype=int)
+    board[100, 99:102] = 1          # a blinker in a big empty board
+    board[10:12, 10:12] = 1         # and a block that never changes
+    stepper = ActiveRegionStepper(board)
+    assert stepper.step() == 4      # the blinker turns: two cells die, two are born
+    assert stepper.active_cells < 50
+    for _ in range(9):
+        stepper.step()
+    assert np.array_equal(stepper.board, run_active_region(board, 10, dense_threshold=1.0))
+    assert np.array_equal(stepper.board[10:12, 10:12], np.ones((2, 2), dtype=int))
+
+def test_dense_fallback_gives_the_same_result():
+    rng = np.random.default_rng(72)
+    board = rng.integers(0, 2, size=(40, 40)).astype(int)
+    always_dense = run_active_region(board, 50, dense_threshold=0.0)
+    never_dense = run_active_region(board, 50, dense_threshold=1.0)
+    expected = board
+    for _ in range(50):
+        expected = next_board_state(expected)
+    assert np.array_equal(always_dense, expected)
+    assert np.array_equal(never_dense, expected)
+
+def test_still_life_goes_quiet():
+    board = np.zeros((10, 10), dtype=int)
+    board[4:6, 4:6] = 1
+    stepper = ActiveRegionStepper(board)
+    assert stepper.step() == 0
+    assert stepper.active_cells == 0
+    assert stepper.step() == 0
@@ -0,0 +1,37 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import next_board_state, next_board_states
+from ga_solver import calculate_fitness, calculate_population_fitness
+
+def test_batch_step_matches_single_steps():
+    rng = np.random.default_rng(7)
+    boards = rng.integers(0, 2, size=(12, 9, 13)).astype(int)
+    stepped = next_board_states(boards)
+    for board, expected in zip(boards, stepped):
+        assert np.array_equal(next_board_state(board), expected)
+
+def test_live_mask_freezes_terminated_boards():
+    rng = np.random.default_rng(8)
+    boards = rng.integers(0, 2, size=(6, 8, 8)).astype(int)
+    live_mask = np.array([True, False, True, False, False, True])
+    stepped = next_board_states(boards, live_mask)
+    for board, new_board, live in zip(boards, stepped, live_mask):
+        if live:
+            assert np.array_equal(new_board, next_board_state(board))
+        else:
+            assert np.array_equal(new_board, board)
+
+def test_population_fitness_matches_calculate_fitness():
+    rng = np.random.default_rng(9)
+    population = list(rng.integers(0, 2, size=(40, 10, 10)).astype(int))
+    glider = np.zeros((10, 10), dtype=int)
+    glider[0, 1] = glider[1, 2] = glider[2, 0] = glider[2, 1] = glider[2, 2] = 1
+    population.append(glider)
+    population.append(np.zeros((10, 10), dtype=int))
+
+    expected = [calculate_fitness(board, 60) for board in population]
+    assert calculate_population_fitness(population, 60) == expected
@@ -0,0 +1,36 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmark import (
+    bench_engine,
+    canonical_patterns,
+    compare_reports,
+    save_baseline,
+    load_baseline
+)
+
+def test_canonical_patterns_are_centered_on_the_board():
+    patterns = canonical_patterns(size=20)
+    assert set(patterns) == {"glider", "blinker", "r_pentomino", "random_soup"}
+    assert patterns["glider"].sum() == 5
+    assert patterns["blinker"][9, 8:11].tolist() == [1, 1, 1]
+    assert all(board.shape == (20, 20) for board in patterns.values())
+
+def test_engine_results_report_throughput():
+    results = bench_engine(sizes=[8])
+    for name in ("engine/next_board_state/8x8", "engine/next_packed_state/8x8"):
+        assert results[name]["cell_updates_per_s"] > 0
+        assert np.isclose(results[name]["boards_per_s"], 1 / results[name]["seconds"])
+
+def test_baseline_round_trip_and_regression_check(tmp_path):
+    baseline = {"results": {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}}
+    path = tmp_path / "baseline.json"
+    save_baseline(baseline, str(path))
+    assert load_baseline(str(path)) == baseline
+
+    current = {"results": {"a": {"seconds": 0.5}, "b": {"seconds": 2.0}, "new": {"seconds": 1.0}}}
+    comparisons = {name: (ratio, is_regression) for name, ratio, is_regression in compare_reports(baseline, current)}
+    assert comparisons == {"a": (2.0, False), "b": (0.5, True)}
@@ -0,0 +1,49 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import next_board_state
+from bitboard import (
+    pack_board,
+    unpack_board,
+    next_packed_state,
+    packed_population,
+    words_per_row
+)
+
+BOARD_SIZES = [(1, 1), (3, 3), (20, 20), (7, 63), (9, 64), (11, 65), (6, 130)]
+
+def test_pack_round_trip():
+    rng = np.random.default_rng(3)
+    for height, width in BOARD_SIZES:
+        board = rng.integers(0, 2, size=(height, width)).astype(int)
+        packed = pack_board(board)
+        assert packed.dtype == np.uint64
+        assert packed.shape == (height, words_per_row(width))
+        assert np.array_equal(unpack_board(packed, width), board)
+        assert packed_population(packed) == board.sum()
+
+def test_packed_step_matches_vectorized_engine():
+    rng = np.random.default_rng(4)
+    for height, width in BOARD_SIZES:
+        board = rng.integers(0, 2, size=(height, width)).astype(int)
+        packed = pack_board(board)
+        for _ in range(25):
+            board = next_board_state(board)
+            packed = next_packed_state(packed, width)
+            assert np.array_equal(unpack_board(packed, width), board), f"mismatch on {height}x{width} board"
+
+def test_packed_step_on_a_stack_of_boards():
+    rng = np.random.default_rng(5)
+    boards = rng.integers(0, 2, size=(8, 12, 70)).astype(int)
+    stepped = unpack_board(next_packed_state(pack_board(boards), 70), 70)
+    for board, expected in zip(boards, stepped):
+        assert np.array_equal(next_board_state(board), expected)
+
+def test_cells_past_the_width_stay_dead():
+    board = np.zeros((3, 10), dtype=int)
+    board[:, 9] = 1
+    packed = next_packed_state(pack_board(board), 10)
+    assert int(packed[1, 0]) >> 10 == 0
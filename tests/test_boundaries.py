@@ -0,0 +1,94 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import (next_board_state, next_board_state_tiled, next_board_states,
+                          board_to_cells, cells_to_board, next_cells_state)
+from ga_solver import calculate_fitness, evaluate_population
+from fitness_cache import FitnessCache
+
+GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+
+def torus_step_loop(board):
+    height, width = board.shape
+    new_board = np.zeros_like(board)
+    for y in range(height):
+        for x in range(width):
+            live_neighbors = sum(board[(y + dy) % height, (x + dx) % width]
+                                 for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx)
+            new_board[y, x] = int(live_neighbors == 3 or (board[y, x] == 1 and live_neighbors == 2))
+    return new_board
+
+def test_torus_matches_loop():
+    rng = np.random.default_rng(14)
+    for shape in [(3, 3), (5, 8), (12, 7)]:
+        board = rng.integers(0, 2, size=shape).astype(int)
+        assert np.array_equal(next_board_state(board, boundary="torus"), torus_step_loop(board))
+        assert np.array_equal(next_board_state_tiled(board, 3, boundary="torus"), torus_step_loop(board))
+
+def test_torus_batch_matches_single_boards():
+    rng = np.random.default_rng(15)
+    boards = rng.integers(0, 2, size=(4, 9, 6)).astype(int)
+    stepped = next_board_states(boards, boundary="torus")
+    for board, new_board in zip(boards, stepped):
+        assert np.array_equal(new_board, torus_step_loop(board))
+
+def test_glider_wraps_around_the_torus():
+    board = np.zeros((8, 8), dtype=int)
+    board[:3, :3] = GLIDER
+    # a glider moves one cell diagonally every 4 generations
+    for _ in range(4 * 8):
+        board = next_board_state(board, boundary="torus")
+    expected = np.zeros((8, 8), dtype=int)
+    expected[:3, :3] = GLIDER
+    assert np.array_equal(board, expected)
+
+def test_infinite_cells_match_a_large_dead_board():
+    rng = np.random.default_rng(16)
+    soup = rng.integers(0, 2, size=(10, 10)).astype(int)
+    large = np.zeros((120, 120), dtype=int)
+    large[55:65, 55:65] = soup
+    cells = board_to_cells(soup, origin=(55, 55))
+    for _ in range(30):
+        large = next_board_state(large)
+        cells = next_cells_state(cells)
+    board, (top, left) = cells_to_board(cells)
+    expected = np.zeros_like(large)
+    expected[top:top + board.shape[0], left:left + board.shape[1]] = board
+    assert np.array_equal(expected, large)
+
+def test_infinite_board_grows_with_the_pattern():
+    board = np.zeros((3, 3), dtype=int)
+    board[:, :] = GLIDER
+    for _ in range(8):
+        board = next_board_state(board, boundary="infinite")
+    assert board.sum() == 5
+    assert board.shape[0] > 3 and board.shape[1] > 3
+
+def test_glider_fitness_depends_on_the_boundary():
+    board = np.zeros((10, 10), dtype=int)
+    board[:3, :3] = GLIDER
+    # it hits the dead border and settles into a block, loops on the torus
+    # after 40 generations and never repeats on the infinite plane
+    assert calculate_fitness(board, 200, boundary="dead") < 40
+    assert calculate_fitness(board, 200, boundary="torus") == 40
+    assert calculate_fitness(board, 200, boundary="infinite") == 200
+
+def test_cycle_detectors_agree_on_the_torus():
+    rng = np.random.default_rng(17)
+    for _ in range(5):
+        board = rng.integers(0, 2, size=(8, 8)).astype(int)
+        fitnesses = {calculate_fitness(board, 300, cycle_detection, boundary="torus")
+                     for cycle_detection in ("set", "hash", "brent")}
+        assert len(fitnesses) == 1
+
+def test_cache_keys_separate_boundaries():
+    board = np.zeros((10, 10), dtype=int)
+    board[:3, :3] = GLIDER
+    cache = FitnessCache(100)
+    dead = evaluate_population([board], 200, cache=cache, boundary="dead")
+    torus = evaluate_population([board], 200, cache=cache, boundary="torus")
+    assert dead[0] != torus[0]
+    assert torus == [40]
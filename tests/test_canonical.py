@@ -0,0 +1,81 @@
+import json
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import make_rng, random_state
+from canonical import (crop_to_content, board_symmetries, canonical_board, canonical_key, canonical_hash,
+                       canonical_hashes, duplicate_mask, count_distinct)
+from ga_solver import calculate_fitness, evaluate_population, make_fitness_cache, replace_duplicates, evolve_patterns
+
+def test_all_orientations_share_one_canonical_form():
+    board = make_rng(1).integers(0, 2, size=(9, 9))
+    orientations = board_symmetries(board)
+    assert len(orientations) == 8
+    assert len({canonical_key(orientation) for orientation in orientations}) == 1
+    assert all(np.array_equal(canonical_board(orientation), canonical_board(board)) for orientation in orientations)
+
+def test_rectangular_boards_keep_their_shape():
+    board = make_rng(2).integers(0, 2, size=(5, 8))
+    orientations = board_symmetries(board)
+    assert len(orientations) == 4
+    assert all(orientation.shape == (5, 8) for orientation in orientations)
+
+def test_translation_only_matters_on_bounded_boards():
+    board = np.zeros((10, 10), dtype=int)
+    board[1, 2:5] = 1
+    shifted = np.roll(board, (4, 3), axis=(0, 1))
+    assert canonical_key(board, "infinite") == canonical_key(shifted, "infinite")
+    assert canonical_key(board) != canonical_key(shifted)
+    assert crop_to_content(board == 1).shape == (1, 3)
+    assert canonical_board(np.zeros((4, 4)), "infinite").shape == (0, 0)
+
+def test_symmetric_boards_have_the_same_fitness():
+    rng = make_rng(3)
+    for boundary in ("dead", "torus", "infinite"):
+        board = random_state(10, 10, rng)
+        fitnesses = {calculate_fitness(orientation.copy(), 200, boundary=boundary, rule="B36/S23")
+                     for orientation in board_symmetries(board)}
+        assert len(fitnesses) == 1
+
+def test_batch_hashes_match_single_board_hashes():
+    rng = make_rng(4)
+    for shape in ((12, 12), (6, 9)):
+        population = [rng.integers(0, 2, size=shape) for _ in range(20)]
+        for boundary in ("dead", "infinite"):
+            assert canonical_hashes(population, boundary) == [canonical_hash(board, boundary) for board in population]
+
+def test_duplicates_are_found_up_to_symmetry():
+    rng = make_rng(5)
+    boards = [random_state(8, 8, rng) for _ in range(3)]
+    population = np.array([boards[0], boards[1], np.rot90(boards[0]), boards[2], boards[1][::-1]])
+    assert duplicate_mask(population).tolist() == [False, False, True, False, True]
+    assert count_distinct(population) == 3
+    assert replace_duplicates(population, 8, 8, "dead", rng) == 2
+    assert np.array_equal(population[0], boards[0])
+
+def test_canonical_cache_simulates_each_pattern_once():
+    board = random_state(10, 10, make_rng(6))
+    population = board_symmetries(board)
+    cache = make_fitness_cache(100, canonical=True)
+    fitnesses = evaluate_population(population, 100, cache=cache)
+    assert len(set(fitnesses)) == 1
+    assert (cache.hits, cache.misses, len(cache)) == (7, 1, 1)
+
+def test_deduplicated_run_has_distinct_boards(tmp_path):
+    metrics_path = str(tmp_path / "metrics.jsonl")
+    evolve_patterns(population_size=12, num_generations=3, simulation_steps=40, board_width=8, board_height=8,
+                    fitness_threshold=10**9, seed=7, num_workers=1, deduplicate=True, metrics_path=metrics_path,
+                    verbose=False)
+    with open(metrics_path) as f:
+        distinct_patterns = [json.loads(line)["distinct_patterns"] for line in f]
+    # the first generation is random, every later one is deduplicated
+    assert distinct_patterns[1:] == [12, 12]
+
+def test_plain_cache_keys_by_default():
+    board = random_state(10, 10, make_rng(8))
+    cache = make_fitness_cache(100)
+    evaluate_population(board_symmetries(board), 100, cache=cache)
+    assert len(cache) == len({orientation.tobytes() for orientation in board_symmetries(board)})
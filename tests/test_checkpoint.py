@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from checkpoint import save_checkpoint, load_checkpoint
+from game_of_life import make_rng
+from ga_solver import evolve_patterns
+
+RUN = dict(population_size=12, mutation_rate=0.05, simulation_steps=40, board_width=9, board_height=7,
+           fitness_threshold=10**9, seed=21, num_workers=1, verbose=False)
+
+def test_round_trip(tmp_path):
+    rng = make_rng(2)
+    population = [rng.integers(0, 2, size=(5, 70)) for _ in range(3)]
+    path = str(tmp_path / "run" / "checkpoint.npz")
+    save_checkpoint(path, population, [4, 5, 6], population[1], 6, [3, 6], 2, rng, {"rule": "B3/S23"})
+    assert os.listdir(tmp_path / "run") == ["checkpoint.npz"]
+
+    checkpoint = load_checkpoint(path)
+    assert all(np.array_equal(a, b) for a, b in zip(checkpoint["population"], population))
+    assert np.array_equal(checkpoint["best_individual"], population[1])
+    assert checkpoint["fitnesses"] == [4, 5, 6]
+    assert checkpoint["fitness_history"] == [3, 6]
+    assert (checkpoint["generation"], checkpoint["best_fitness"]) == (2, 6)
+    assert checkpoint["settings"] == {"rule": "B3/S23"}
+    restored = make_rng()
+    restored.bit_generator.state = checkpoint["rng_state"]
+    assert restored.random() == rng.random()
+
+def test_resumed_run_matches_uninterrupted_run(tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    expected_best, expected_history = evolve_patterns(num_generations=6, **RUN)
+
+    # the first run stops after 4 generations, the last checkpoint is at 3
+    evolve_patterns(num_generations=4, checkpoint_path=path, checkpoint_interval=3, **RUN)
+    assert load_checkpoint(path)["generation"] == 3
+    best, history = evolve_patterns(num_generations=6, resume_from=path, **RUN)
+    assert history == expected_history
+    assert np.array_equal(best, expected_best)
+
+def test_resume_rejects_other_settings(tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    evolve_patterns(num_generations=2, checkpoint_path=path, checkpoint_interval=1, **RUN)
+    with pytest.raises(ValueError, match="mutation_rate"):
+        evolve_patterns(num_generations=4, resume_from=path, **dict(RUN, mutation_rate=0.1))
+
+def test_checkpoint_interval_must_be_positive(tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    for interval in (0, -2):
+        with pytest.raises(ValueError, match="Checkpoint interval"):
+            evolve_patterns(num_generations=2, checkpoint_path=path, checkpoint_interval=interval, **RUN)
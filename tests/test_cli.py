@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main
+from pattern_archive import load_archive
+from checkpoint import load_checkpoint
+
+def test_main_imports_without_gui_stacks():
+    assert "pygame" not in sys.modules
+    assert "matplotlib.pyplot" not in sys.modules
+
+def test_evolve_runs_headless(tmp_path, capsys):
+    output = str(tmp_path / "results")
+    exit_code = main.main(["evolve", "--population-size", "6", "--generations", "2", "--simulation-steps", "20",
+                           "--width", "6", "--height", "5", "--seed", "3", "--output", output,
+                           "--checkpoint-interval", "1"])
+    assert exit_code == 0
+    files = os.listdir(output)
+    checkpoints = [name for name in files if name.startswith("checkpoint_")]
+    assert len(checkpoints) == 1
+    assert len([name for name in files if name.startswith("metrics_") and name.endswith(".csv")]) == 1
+    archives = [name for name in files if name.startswith("evolved_pattern_")]
+    assert len(archives) == 1
+    archive = load_archive(os.path.join(output, archives[0]))
+    assert archive["pattern"].shape == (5, 6)
+    assert archive["metadata"]["seed"] == 3 and archive["metadata"]["population_size"] == 6
+    assert len(archive["fitness_history"]) == 2
+    assert "Fitness of the evolved pattern" in capsys.readouterr().out
+    assert "pygame" not in sys.modules
+
+def test_flags_are_optional_overrides():
+    args = main.build_parser().parse_args(["evolve", "--rule", "B36/S23"])
+    assert args.rule == "B36/S23"
+    assert args.population_size is None
+    assert args.profile is None
+    assert main.build_parser().parse_args(["evolve", "--profile"]).profile is True
+
+def test_no_subcommand_means_evolve(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "command_evolve", lambda args: calls.append(args.num_generations) or 0)
+    # build_parser binds the handler when it runs, so the patch is picked up
+    assert main.main(["--generations", "7"]) == 0
+    assert calls == [7]
+
+def test_render_steps_a_saved_pattern(tmp_path, capsys):
+    path = str(tmp_path / "blinker.txt")
+    np.savetxt(path, np.array([[0, 0, 0], [1, 1, 1], [0, 0, 0]]), fmt="%d")
+    assert main.main(["render", path, "--generations", "1", "--delay", "0"]) == 0
+    out = capsys.readouterr().out
+    assert "Generation 1" in out
+    assert "|###|" in out and "| # |" in out
+
+def test_checkpoint_interval_below_one_is_rejected():
+    with pytest.raises(SystemExit):
+        main.build_parser().parse_args(["evolve", "--checkpoint-interval", "0"])
+
+def test_resumed_archive_keeps_the_seed(tmp_path):
+    output = str(tmp_path / "results")
+    run = ["evolve", "--population-size", "6", "--simulation-steps", "20", "--width", "6", "--height", "5",
+           "--output", output, "--checkpoint-interval", "1"]
+    assert main.main(run + ["--generations", "2", "--seed", "3"]) == 0
+    for name in os.listdir(output):
+        if name.startswith("evolved_pattern_"):
+            os.remove(os.path.join(output, name))
+    checkpoint = [name for name in os.listdir(output) if name.startswith("checkpoint_")][0]
+    assert main.main(run + ["--generations", "3", "--resume", os.path.join(output, checkpoint)]) == 0
+    archives = [name for name in os.listdir(output) if name.startswith("evolved_pattern_")]
+    assert load_archive(os.path.join(output, archives[0]))["metadata"]["seed"] == 3
+
+def test_failed_save_is_reported(tmp_path, capsys):
+    # a file where the results folder should be
+    blocked = tmp_path / "results"
+    blocked.write_text("")
+    assert main.save_results(np.eye(4, dtype=int), [1, 2], str(blocked)) is None
+    assert "Error when trying to save the results" in capsys.readouterr().out
+
+def test_new_run_keeps_an_earlier_checkpoint(tmp_path, monkeypatch):
+    output = str(tmp_path / "results")
+    run = ["evolve", "--population-size", "6", "--generations", "2", "--simulation-steps", "20", "--width", "6",
+           "--height", "5", "--output", output, "--checkpoint-interval", "1"]
+    # a fixed timestamp for each run
+    monkeypatch.setattr(main.time, "strftime", lambda form: "20250101-000000")
+    assert main.main(run + ["--seed", "1"]) == 0
+    monkeypatch.setattr(main.time, "strftime", lambda form: "20250101-000100")
+    assert main.main(run + ["--seed", "2"]) == 0
+    checkpoints = sorted(name for name in os.listdir(output) if name.startswith("checkpoint_"))
+    assert checkpoints == ["checkpoint_20250101-000000.npz", "checkpoint_20250101-000100.npz"]
+    assert load_checkpoint(os.path.join(output, checkpoints[0]))["settings"]["seed"] == 1
+
+def test_runs_keep_their_own_metrics(tmp_path, monkeypatch):
+    output = str(tmp_path / "results")
+    run = ["evolve", "--population-size", "6", "--simulation-steps", "20", "--width", "6", "--height", "5",
+           "--output", output, "--checkpoint-interval", "1"]
+    monkeypatch.setattr(main.time, "strftime", lambda form: "20250101-000000")
+    assert main.main(run + ["--generations", "2", "--seed", "1"]) == 0
+    monkeypatch.setattr(main.time, "strftime", lambda form: "20250101-000100")
+    assert main.main(run + ["--generations", "2", "--seed", "2"]) == 0
+    monkeypatch.setattr(main.time, "strftime", lambda form: "20250101-000200")
+    assert main.main(run + ["--generations", "3", "--resume", os.path.join(output, "checkpoint_20250101-000000.npz")]) == 0
+
+    metrics = sorted(name for name in os.listdir(output) if name.startswith("metrics_"))
+    assert metrics == ["metrics_20250101-000000.csv", "metrics_20250101-000100.csv"]
+    with open(os.path.join(output, metrics[0])) as f:
+        assert [line.split(",")[0] for line in f.read().splitlines()[1:]] == ["1", "2", "3"]
+
+def test_plot_file_leaves_the_backend_alone(tmp_path):
+    matplotlib = pytest.importorskip("matplotlib")
+    backend = matplotlib.get_backend()
+    path = str(tmp_path / "fitness_history.png")
+    main.plot_ga_results([1, 3, 7], path)
+    assert os.path.getsize(path) > 0
+    assert matplotlib.get_backend() == backend
@@ -0,0 +1,66 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import ga_solver
+from game_of_life import next_board_state
+from ga_solver import calculate_fitness, evaluate_population, CYCLE_DETECTORS, HASH_SNAPSHOT_INTERVAL
+
+def _known_patterns():
+    blinker = np.zeros((5, 5), dtype=int)
+    blinker[1:4, 2] = 1
+    block = np.zeros((4, 4), dtype=int)
+    block[1:3, 1:3] = 1
+    glider = np.zeros((6, 6), dtype=int)
+    glider[1, 1] = glider[2, 2] = glider[3, 0] = glider[3, 1] = glider[3, 2] = 1
+    lone_cell = np.zeros((3, 3), dtype=int)
+    lone_cell[1, 1] = 1
+    return [blinker, block, glider, lone_cell, np.zeros((4, 4), dtype=int)]
+
+def test_all_strategies_agree_with_visited_set():
+    rng = np.random.default_rng(21)
+    boards = _known_patterns() + list(rng.integers(0, 2, size=(40, 8, 8)).astype(int))
+    for steps in (1, 2, 5, 40, 200):
+        for board in boards:
+            expected = calculate_fitness(board, steps, "set")
+            for strategy in CYCLE_DETECTORS:
+                assert calculate_fitness(board, steps, strategy) == expected, (strategy, steps)
+
+def test_evaluate_population_uses_any_strategy():
+    rng = np.random.default_rng(22)
+    population = list(rng.integers(0, 2, size=(15, 10, 10)).astype(int))
+    expected = evaluate_population(population, 100, "set")
+    assert evaluate_population(population, 100, "brent") == expected
+    assert evaluate_population(population, 100, "hash") == expected
+
+def test_hash_collisions_never_end_a_simulation(monkeypatch):
+    # every board hashes alike, so each hit has to be confirmed by replaying
+    monkeypatch.setattr(ga_solver, "hash", lambda board_bytes: 0, raising=False)
+    monkeypatch.setattr(ga_solver, "HASH_SNAPSHOT_INTERVAL", 4)
+    rng = np.random.default_rng(23)
+    for board in _known_patterns() + list(rng.integers(0, 2, size=(10, 8, 8)).astype(int)):
+        assert ga_solver._fitness_hash_index(board, 60) == calculate_fitness(board, 60, "set")
+
+def test_hash_hit_replays_from_the_nearest_snapshot():
+    rng = np.random.default_rng(24)
+    board = max(rng.integers(0, 2, size=(40, 16, 16)).astype(int), key=lambda board: calculate_fitness(board, 2000))
+    fitness = calculate_fitness(board, 2000)
+    assert fitness > 2 * HASH_SNAPSHOT_INTERVAL
+    calls = []
+
+    def counting_step(board):
+        calls.append(1)
+        return next_board_state(board)
+
+    assert ga_solver._fitness_hash_index(board, 2000, counting_step) == fitness
+    assert len(calls) < fitness + HASH_SNAPSHOT_INTERVAL
+
+def test_unknown_strategy_is_rejected():
+    try:
+        calculate_fitness(np.zeros((3, 3), dtype=int), 10, "floyd")
+    except ValueError:
+        pass
+    else:
+        assert False, "expected ValueError"
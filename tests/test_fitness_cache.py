@@ -0,0 +1,79 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import next_board_state
+from fitness_cache import FitnessCache, TrajectoryCache, board_key
+from ga_solver import evaluate_population, calculate_fitness
+
+def test_lru_eviction_and_counters():
+    cache = FitnessCache(max_size=2)
+    boards = [np.full((3, 3), value, dtype=int) for value in (0, 1)] + [np.eye(3, dtype=int)]
+    keys = [cache.key(board, 10) for board in boards]
+
+    cache.put(keys[0], 1)
+    cache.put(keys[1], 2)
+    assert cache.get(keys[0]) == 1      # keys[0] is now the most recent
+    cache.put(keys[2], 3)               # evicts keys[1]
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) == 3
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.hit_rate == 2 / 3
+
+def test_key_depends_on_shape_and_steps():
+    cache = FitnessCache()
+    assert board_key(np.zeros((2, 4), dtype=int)) != board_key(np.zeros((4, 2), dtype=int))
+    board = np.ones((4, 4), dtype=int)
+    assert cache.key(board, 10) != cache.key(board, 20)
+    assert cache.key(board, 10) == cache.key(board.astype(np.uint8), 10)
+
+def test_cached_evaluation_matches_uncached():
+    rng = np.random.default_rng(41)
+    population = list(rng.integers(0, 2, size=(20, 10, 10)).astype(int))
+    population += [board.copy() for board in population[:5]]
+    expected = evaluate_population(population, 100)
+
+    cache = FitnessCache(max_size=100)
+    assert evaluate_population(population, 100, cache=cache) == expected
+    assert (cache.hits, cache.misses) == (5, 20)
+    assert evaluate_population(population, 100, cache=cache) == expected
+    assert cache.hits == 5 + 25
+
+def _glider_into_block_board():
+    # a glider that crashes into a block, so many boards share the same ash
+    board = np.zeros((12, 12), dtype=int)
+    board[1, 2] = board[2, 3] = board[3, 1] = board[3, 2] = board[3, 3] = 1
+    board[8:10, 8:10] = 1
+    return board
+
+def test_trajectory_cache_matches_plain_fitness():
+    rng = np.random.default_rng(42)
+    boards = list(rng.integers(0, 2, size=(60, 8, 8)).astype(int))
+    boards.append(_glider_into_block_board())
+    # successors of earlier boards start part way along known trajectories
+    boards += [next_board_state(next_board_state(board)) for board in boards[:20]]
+
+    trajectory_cache = TrajectoryCache(max_size=100000)
+    for steps in (3, 30, 300):
+        for board in boards:
+            expected = calculate_fitness(board, steps)
+            assert calculate_fitness(board, steps, trajectory_cache=trajectory_cache) == expected
+    assert trajectory_cache.hits > 0
+
+def test_trajectory_cache_is_bounded_and_persists(tmp_path):
+    rng = np.random.default_rng(43)
+    boards = list(rng.integers(0, 2, size=(10, 8, 8)).astype(int))
+    trajectory_cache = TrajectoryCache(max_size=50)
+    for board in boards:
+        calculate_fitness(board, 200, trajectory_cache=trajectory_cache)
+    assert len(trajectory_cache) <= 50
+
+    path = tmp_path / "trajectories.pkl"
+    trajectory_cache.save(path)
+    reloaded = TrajectoryCache.load(path, max_size=50)
+    assert len(reloaded) == len(trajectory_cache)
+    for board in boards:
+        assert calculate_fitness(board, 200, trajectory_cache=reloaded) == calculate_fitness(board, 200)
@@ -0,0 +1,44 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ga_solver import crossover, crossover_batch, mutation
+
+def test_crossover_swaps_cells_between_children():
+    rng = np.random.default_rng(51)
+    parent1 = np.ones((40, 40), dtype=int)
+    parent2 = np.zeros((40, 40), dtype=int)
+    child1, child2 = crossover(parent1, parent2, rng)
+    assert np.array_equal(child1 + child2, parent1 + parent2)
+    assert child1.dtype == parent1.dtype
+    # each cell comes from parent1 with probability 0.5
+    assert abs(child1.mean() - 0.5) < 0.05
+
+def test_crossover_batch_respects_crossover_rate():
+    rng = np.random.default_rng(52)
+    parents1 = np.ones((2000, 6, 6), dtype=int)
+    parents2 = np.zeros((2000, 6, 6), dtype=int)
+    children1, children2 = crossover_batch(parents1, parents2, 0.8, rng)
+    assert np.array_equal(children1 + children2, parents1 + parents2)
+
+    copied_pairs = children1.all(axis=(1, 2))
+    # uncrossed pairs are plain copies, a crossed 6x6 pair is all ones with chance 2**-36
+    assert abs(copied_pairs.mean() - 0.2) < 0.03
+    assert abs(children1[~copied_pairs].mean() - 0.5) < 0.02
+
+def test_mutation_flips_cells_at_the_mutation_rate():
+    rng = np.random.default_rng(53)
+    individual = rng.integers(0, 2, size=(200, 200)).astype(int)
+    mutated = mutation(individual, 0.03, rng)
+    assert set(np.unique(mutated)) <= {0, 1}
+    assert abs((mutated != individual).mean() - 0.03) < 0.003
+    assert np.array_equal(mutation(individual, 0.0, rng), individual)
+
+def test_mutation_works_on_a_batch():
+    rng = np.random.default_rng(54)
+    batch = np.zeros((50, 10, 10), dtype=int)
+    mutated = mutation(batch, 0.5, rng)
+    assert mutated.shape == batch.shape
+    assert abs(mutated.mean() - 0.5) < 0.03
@@ -0,0 +1,57 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import next_board_state
+from hashlife import HashLife, hashlife_fitness
+from ga_solver import calculate_fitness, evaluate_population
+
+def _steps(board, generations):
+    for _ in range(generations):
+        board = next_board_state(board)
+    return board
+
+def test_board_round_trip():
+    rng = np.random.default_rng(61)
+    universe = HashLife()
+    for shape in [(1, 1), (2, 3), (20, 20), (13, 29)]:
+        board = rng.integers(0, 2, size=shape).astype(int)
+        root, board_shape = universe.from_board(board)
+        assert np.array_equal(universe.to_board(root, board_shape), board)
+        assert np.array_equal(universe.to_board(universe.grow(root), board_shape), board)
+        assert root.population == board.sum()
+
+def test_jumps_match_generation_by_generation_stepping():
+    rng = np.random.default_rng(62)
+    universe = HashLife()
+    for shape in [(3, 3), (5, 8), (20, 20), (13, 29)]:
+        board = rng.integers(0, 2, size=shape).astype(int)
+        root, board_shape = universe.from_board(board)
+        for generations in (1, 2, 7, 64, 100, 333):
+            expected = _steps(board, generations)
+            assert np.array_equal(universe.to_board(universe.advance(root, generations), board_shape), expected)
+
+def test_equal_states_are_the_same_node():
+    universe = HashLife()
+    blinker = np.zeros((5, 5), dtype=int)
+    blinker[2, 1:4] = 1
+    root, _ = universe.from_board(blinker)
+    assert universe.advance(root, 2) is root
+    assert universe.advance(root, 1) is not root
+
+def test_hashlife_fitness_matches_calculate_fitness():
+    rng = np.random.default_rng(63)
+    universe = HashLife()
+    boards = list(rng.integers(0, 2, size=(25, 10, 10)).astype(int)) + [np.zeros((4, 4), dtype=int)]
+    for steps in (1, 2, 10, 300):
+        for board in boards:
+            assert hashlife_fitness(board, steps, universe) == calculate_fitness(board, steps)
+
+def test_long_horizon_and_engine_option():
+    rng = np.random.default_rng(64)
+    population = list(rng.integers(0, 2, size=(6, 20, 20)).astype(int))
+    expected = evaluate_population(population, 100000)
+    assert evaluate_population(population, 100000, engine="hashlife") == expected
+    assert calculate_fitness(population[0], 100000, engine="hashlife") == expected[0]
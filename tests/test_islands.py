@@ -0,0 +1,80 @@
+import multiprocessing
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from islands import QueueTransport, migrate, run_island, evolve_islands, _collect_results
+from game_of_life import make_rng
+from ga_solver import calculate_fitness
+
+def test_transport_round_trip():
+    transport = QueueTransport(2)
+    boards = [np.eye(5, dtype=int), np.ones((5, 5), dtype=int)]
+    transport.send(1, boards, [3, 7])
+    # mp.Queue hands items over through a feeder thread
+    received = ([], [])
+    while not received[0]:
+        received = transport.receive(1)
+    individuals, fitnesses = received
+    assert fitnesses == [3, 7]
+    assert all(np.array_equal(a, b) for a, b in zip(individuals, boards))
+    assert transport.receive(0) == ([], [])
+
+class ListTransport:
+    def __init__(self, num_islands):
+        self.inboxes = [[] for _ in range(num_islands)]
+
+    def send(self, island, individuals, fitnesses):
+        self.inboxes[island].append((individuals, fitnesses))
+
+    def receive(self, island):
+        individuals, fitnesses = [], []
+        for migrants, migrant_fitnesses in self.inboxes[island]:
+            individuals.extend(migrants)
+            fitnesses.extend(migrant_fitnesses)
+        self.inboxes[island] = []
+        return individuals, fitnesses
+
+def test_migrants_replace_the_worst():
+    transport = ListTransport(2)
+    population = [np.full((3, 3), value) for value in range(4)]
+    transport.send(0, [np.full((3, 3), 9)], [50])
+    new_population, new_fitnesses = migrate(population, [5, 1, 8, 3], 0, 2, transport, 2)
+    # the two best went to island 1, the migrant took the place of the worst
+    sent, sent_fitnesses = transport.inboxes[1][0]
+    assert sent_fitnesses == [8, 5]
+    assert np.array_equal(sent[0], population[2])
+    assert new_fitnesses == [5, 50, 8, 3]
+    assert np.array_equal(new_population[1], np.full((3, 3), 9))
+
+def test_single_island_is_reproducible():
+    settings = dict(population_size=8, board_width=8, board_height=8, fitness_cache_size=100, num_generations=3,
+                    simulation_steps=30, cycle_detection="set", engine="numpy", boundary="dead", rule="B3/S23",
+                    migration_interval=1, migration_size=1, fitness_threshold=10**9, crossover_rate=0.8,
+                    mutation_rate=0.03, tournament_size=3, selection="tournament")
+    first = run_island(0, 1, ListTransport(1), make_rng(5), settings)
+    second = run_island(0, 1, ListTransport(1), make_rng(5), settings)
+    assert first[2] == second[2]
+    assert np.array_equal(first[0], second[0])
+    assert first[1] == calculate_fitness(first[0], 30) == max(first[2])
+
+def test_evolve_islands_in_processes():
+    best_individual, histories = evolve_islands(num_islands=3, migration_interval=1, migration_size=2,
+                                                population_size=8, num_generations=4, simulation_steps=30,
+                                                board_width=8, board_height=8, seed=3, verbose=False)
+    assert len(histories) == 3
+    assert all(len(history) == 4 for history in histories)
+    assert calculate_fitness(best_individual, 30) == max(max(history) for history in histories)
+
+def test_dead_island_is_reported():
+    # an island killed before it can post a result must not hang the run
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    process = context.Process(target=os._exit, args=(3,))
+    process.start()
+    process.join()
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        _collect_results([process], results, poll_seconds=0.1)
@@ -0,0 +1,67 @@
+import json
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from metrics import MetricsWriter, METRIC_FIELDS, population_diversity, generation_metrics
+from ga_solver import evolve_patterns
+
+RUN = dict(population_size=10, simulation_steps=30, board_width=8, board_height=8, fitness_threshold=10**9,
+           seed=8, num_workers=1, verbose=False)
+
+def test_diversity_is_mean_pairwise_hamming_distance():
+    rng = np.random.default_rng(19)
+    population = rng.integers(0, 2, size=(7, 4, 5))
+    distances = [np.mean(a != b) for i, a in enumerate(population) for b in population[i + 1:]]
+    assert np.isclose(population_diversity(population), np.mean(distances))
+    assert population_diversity([population[0]] * 3) == 0.0
+
+def test_generation_metrics():
+    row = generation_metrics(3, np.zeros((4, 2, 2)), [1, 2, 3, 10], 0.5, 0.25)
+    assert row["best_fitness"] == 10
+    assert row["mean_fitness"] == 4.0
+    assert row["median_fitness"] == 2.5
+    assert sorted(row) == sorted(METRIC_FIELDS)
+
+def test_rows_are_buffered_until_flush(tmp_path):
+    path = str(tmp_path / "metrics.csv")
+    writer = MetricsWriter(path, flush_seconds=3600)
+    writer.write(generation_metrics(1, np.zeros((2, 2, 2)), [1, 2], 0.1))
+    with open(path) as f:
+        assert f.read().splitlines() == [",".join(METRIC_FIELDS)]
+    writer.close()
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 2
+    # no cache, no hit rate
+    assert lines[1].startswith("1,2,1.5,1.5,") and lines[1].endswith(",")
+
+def test_evolve_streams_jsonl_and_appends_on_resume(tmp_path):
+    metrics_path = str(tmp_path / "metrics.jsonl")
+    checkpoint_path = str(tmp_path / "checkpoint.npz")
+    _, history = evolve_patterns(num_generations=3, metrics_path=metrics_path, checkpoint_path=checkpoint_path,
+                                 checkpoint_interval=2, **RUN)
+    with open(metrics_path) as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["generation"] for row in rows] == [1, 2, 3]
+    assert [row["best_fitness"] for row in rows] == history
+    assert all(0 <= row["cache_hit_rate"] <= 1 for row in rows)
+
+    # generation 3 ran after the last checkpoint, the resumed run replaces its row
+    evolve_patterns(num_generations=4, metrics_path=metrics_path, resume_from=checkpoint_path, **RUN)
+    with open(metrics_path) as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["generation"] for row in rows] == [1, 2, 3, 4]
+
+def test_resumed_csv_metrics_have_each_generation_once(tmp_path):
+    metrics_path = str(tmp_path / "metrics.csv")
+    checkpoint_path = str(tmp_path / "checkpoint.npz")
+    evolve_patterns(num_generations=4, metrics_path=metrics_path, checkpoint_path=checkpoint_path,
+                    checkpoint_interval=3, **RUN)
+    evolve_patterns(num_generations=6, metrics_path=metrics_path, resume_from=checkpoint_path, **RUN)
+    with open(metrics_path) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ",".join(METRIC_FIELDS)
+    assert [int(line.split(",")[0]) for line in lines[1:]] == [1, 2, 3, 4, 5, 6]
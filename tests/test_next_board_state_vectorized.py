@@ -0,0 +1,47 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import (
+    next_board_state,
+    next_board_state_loop,
+    count_live_neighbors,
+    dead_state
+)
+
+def test_matches_loop_on_random_boards():
+    rng = np.random.default_rng(1234)
+    for height, width in [(1, 1), (1, 7), (5, 1), (3, 3), (20, 20), (17, 31)]:
+        for _ in range(10):
+            board = rng.integers(0, 2, size=(height, width)).astype(int)
+            expected = next_board_state_loop(board)
+            actual = next_board_state(board)
+            assert np.array_equal(actual, expected), f"mismatch on {height}x{width} board"
+            assert actual.dtype == expected.dtype
+
+def test_matches_loop_over_many_generations():
+    rng = np.random.default_rng(99)
+    board = rng.integers(0, 2, size=(20, 20)).astype(int)
+    vectorized, looped = board, board
+    for _ in range(50):
+        vectorized = next_board_state(vectorized)
+        looped = next_board_state_loop(looped)
+        assert np.array_equal(vectorized, looped)
+
+def test_border_cells_see_dead_neighbors():
+    board = np.ones((3, 3), dtype=int)
+    expected = np.array([
+        [3, 5, 3],
+        [5, 8, 5],
+        [3, 5, 3]
+    ])
+    assert np.array_equal(count_live_neighbors(board), expected)
+
+def test_input_is_not_modified():
+    board = dead_state(4, 4)
+    board[1, 1:4] = 1
+    before = board.copy()
+    next_board_state(board)
+    assert np.array_equal(board, before)
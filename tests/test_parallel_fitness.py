@@ -0,0 +1,24 @@
+import numpy as np
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ga_solver import evaluate_population, _evaluate_packed_chunk
+from bitboard import pack_board
+
+def test_packed_chunk_matches_serial():
+    rng = np.random.default_rng(31)
+    boards = rng.integers(0, 2, size=(9, 12, 15)).astype(int)
+    expected = evaluate_population(list(boards), 150)
+    assert _evaluate_packed_chunk(pack_board(boards).tobytes(), boards.shape, 150, {"cycle_detection": "set"}) == expected
+
+def test_process_pool_matches_serial():
+    rng = np.random.default_rng(32)
+    population = list(rng.integers(0, 2, size=(30, 20, 20)).astype(int))
+    expected = evaluate_population(population, 200)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for num_chunks in (1, 3, 8, 50):
+            assert evaluate_population(population, 200, executor=executor, num_chunks=num_chunks) == expected
+        assert evaluate_population(population, 200, "brent", executor=executor, num_chunks=4) == expected
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pattern_archive import board_to_rle, rle_to_board, save_archive, load_archive
+
+def test_glider_rle():
+    glider = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+    assert board_to_rle(glider) == "x = 3, y = 3, rule = B3/S23\nbo$2bo$3o!\n"
+
+def test_empty_rows_and_trailing_dead_cells():
+    board = np.zeros((6, 8), dtype=int)
+    board[0, 7] = 1
+    board[4, :3] = 1
+    assert board_to_rle(board, "B36/S23") == "x = 8, y = 6, rule = B36/S23\n7bo4$3o!\n"
+
+def test_rle_round_trip():
+    rng = np.random.default_rng(20)
+    for shape in [(1, 1), (4, 5), (20, 20), (3, 300)]:
+        board = rng.integers(0, 2, size=shape)
+        rle = board_to_rle(board)
+        assert all(len(line) <= 70 for line in rle.splitlines()[1:])
+        parsed, rule = rle_to_board(rle)
+        assert np.array_equal(parsed, board)
+        assert rule == "B3/S23"
+
+def test_reads_rle_from_other_programs():
+    text = "#N Blinker\n#C comment\nx = 3, y = 1\n3o!\n"
+    board, rule = rle_to_board(text)
+    assert board.tolist() == [[1, 1, 1]]
+    with pytest.raises(ValueError):
+        rle_to_board("3o!")
+    with pytest.raises(ValueError):
+        rle_to_board("x = 3, y = 1\n3z!")
+
+def test_archive_round_trip(tmp_path):
+    rng = np.random.default_rng(21)
+    pattern = rng.integers(0, 2, size=(20, 20))
+    path = str(tmp_path / "run.npz")
+    save_archive(path, pattern, [3, 5, 9], {"seed": 4, "rule": "B36/S23", "fitness": 9})
+    assert os.listdir(tmp_path) == ["run.npz"]
+
+    archive = load_archive(path)
+    assert np.array_equal(archive["pattern"], pattern)
+    assert archive["fitness_history"] == [3, 5, 9]
+    assert archive["metadata"]["seed"] == 4 and archive["metadata"]["fitness"] == 9
+    assert "timestamp" in archive["metadata"]
+    board, rule = rle_to_board(archive["rle"])
+    assert np.array_equal(board, pattern) and rule == "B36/S23"
+    # one compressed file instead of a text dump plus an int64 .npy
+    assert os.path.getsize(path) < pattern.size * 8
@@ -0,0 +1,61 @@
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from population_store import PopulationStore
+from game_of_life import make_rng
+from ga_solver import breed_population, evolve_patterns, calculate_fitness
+
+RUN = dict(population_size=11, num_generations=3, simulation_steps=30, board_width=7, board_height=6,
+           fitness_threshold=10**9, seed=13, num_workers=1, verbose=False)
+
+def test_double_buffer_swaps():
+    store = PopulationStore(3, 2, 4)
+    assert store.current.shape == (3, 2, 4) and store.current.dtype == np.uint8
+    store.next[:] = 1
+    assert not store.current.any()
+    store.swap()
+    assert store.current.all() and not store.next.any()
+    assert len(store) == 3
+
+def test_memmap_backing_file(tmp_path):
+    path = str(tmp_path / "population.mmap")
+    store = PopulationStore(5, 3, 3, path)
+    assert os.path.getsize(path) == 2 * 5 * 3 * 3
+    store.current[2, 1, 1] = 1
+    store.flush()
+    assert np.memmap(path, dtype=np.uint8, mode="r")[2 * 9 + 4] == 1
+    store.close()
+    assert not os.path.exists(path)
+
+def test_breed_into_buffer():
+    population = make_rng(2).integers(0, 2, size=(9, 4, 4)).astype(np.uint8)
+    fitnesses = list(range(9))
+    best = np.ones((4, 4), dtype=int)
+    out = np.full((9, 4, 4), 7, dtype=np.uint8)
+    result = breed_population(population, fitnesses, best, 9, 0.8, 0.05, 3, make_rng(3), out=out)
+    assert result is out
+    assert np.array_equal(out[0], population[8])
+    assert set(np.unique(out)) <= {0, 1}
+
+    # same draws, same offspring as breeding into a new array
+    expected = breed_population(population, fitnesses, best, 9, 0.8, 0.05, 3, make_rng(3))
+    assert np.array_equal(expected, out)
+
+def test_filler_copies_of_the_best_individual():
+    # an even population leaves one spot after the elite and the pairs
+    population = np.zeros((4, 3, 3), dtype=np.uint8)
+    best = np.ones((3, 3), dtype=int)
+    out = breed_population(population, [0, 0, 0, 0], best, 4, 0.0, 0.0, 2, make_rng(1))
+    assert np.array_equal(out[3], best)
+
+def test_memmapped_run_matches_in_memory_run(tmp_path):
+    path = str(tmp_path / "population.mmap")
+    best, history = evolve_patterns(**RUN)
+    mapped_best, mapped_history = evolve_patterns(population_store_path=path, **RUN)
+    assert mapped_history == history
+    assert np.array_equal(mapped_best, best)
+    assert best.dtype == int and calculate_fitness(best, 30) == max(history)
+    assert not os.path.exists(path)
@@ -0,0 +1,110 @@
+import json
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from concurrent.futures import ProcessPoolExecutor
+from game_of_life import make_rng, random_state, next_board_state
+from ga_solver import evaluate_population, calculate_fitness, evolve_patterns, CYCLE_DETECTORS
+from fitness_cache import TrajectoryCache
+from profiling import Instrumentation, PROFILE_PHASES, PROFILE_FIELDS, phase
+
+RUN = dict(population_size=12, num_generations=3, simulation_steps=60, board_width=8, board_height=8,
+           fitness_threshold=10**9, seed=9, num_workers=1, verbose=False)
+
+def test_phase_is_a_no_op_without_instrumentation():
+    with phase(None, "evaluation"):
+        pass
+    instrumentation = Instrumentation()
+    with phase(instrumentation, "evaluation"):
+        pass
+    assert instrumentation.phase_calls["evaluation"] == 1
+    assert instrumentation.phase_seconds["evaluation"] >= 0
+
+def _count_steps(board, num_simulation_steps, cycle_detection):
+    calls = []
+    def step(state):
+        calls.append(1)
+        return next_board_state(state)
+    CYCLE_DETECTORS[cycle_detection]((np.asarray(board) == 1).astype(int), num_simulation_steps, step)
+    return len(calls)
+
+def test_counters_match_the_simulated_boards():
+    rng = make_rng(10)
+    population = [random_state(10, 10, rng) for _ in range(15)]
+    expected = [calculate_fitness(board, 80) for board in population]
+    for cycle_detection in ("set", "brent"):
+        instrumentation = Instrumentation()
+        assert evaluate_population(population, 80, cycle_detection, instrumentation=instrumentation) == expected
+        assert instrumentation.counters["boards_simulated"] == len(population)
+        steps = sum(_count_steps(board, 80, cycle_detection) for board in population)
+        assert instrumentation.counters["steps_simulated"] == steps
+    # brent steps its hare and tortoise separately, so it does more work than the fitness
+    assert instrumentation.counters["steps_simulated"] > sum(expected)
+    # the packed batch kernel also tells deaths from cycles
+    counters = instrumentation.counters
+    packed = Instrumentation()
+    evaluate_population(population, 80, "set", instrumentation=packed)
+    assert packed.counters["early_deaths"] + packed.counters["cycles_detected"] == packed.counters["boards_resolved"]
+    assert packed.counters["boards_resolved"] >= counters["boards_resolved"]
+
+def test_trajectory_cache_counts_only_the_steps_it_takes():
+    board = random_state(10, 10, make_rng(15))
+    trajectory_cache = TrajectoryCache(max_size=1000)
+    first = Instrumentation()
+    fitness = evaluate_population([board], 80, trajectory_cache=trajectory_cache, instrumentation=first)[0]
+    assert fitness < 80
+    assert first.counters["steps_simulated"] == _count_steps(board, 80, "set")
+    # the successor starts on a state the cache already resolved
+    again = Instrumentation()
+    assert evaluate_population([next_board_state(board)], 80, trajectory_cache=trajectory_cache,
+                               instrumentation=again) == [fitness - 1]
+    assert again.counters["steps_simulated"] == 0
+
+def test_pool_workers_send_their_counters_back():
+    population = [random_state(10, 10, make_rng(12)) for _ in range(6)]
+    serial = Instrumentation()
+    evaluate_population(population, 80, "brent", instrumentation=serial)
+    pooled = Instrumentation()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        evaluate_population(population, 80, "brent", executor=executor, num_chunks=2, instrumentation=pooled)
+    assert pooled.counters == serial.counters
+
+def test_profiling_does_not_change_the_run(tmp_path):
+    best, history = evolve_patterns(**RUN)
+    profile_path = str(tmp_path / "profile.json")
+    metrics_path = str(tmp_path / "metrics.jsonl")
+    profiled_best, profiled_history = evolve_patterns(profile_path=profile_path, metrics_path=metrics_path,
+                                                      profile_window=(2, 2), tracemalloc_window=(1, 3),
+                                                      checkpoint_path=str(tmp_path / "checkpoint.npz"),
+                                                      checkpoint_interval=1, **RUN)
+    assert profiled_history == history
+    assert np.array_equal(profiled_best, best)
+
+    with open(profile_path) as f:
+        summary = json.load(f)
+    assert summary["generations"] == 3
+    assert set(PROFILE_PHASES) <= set(summary["phases"])
+    assert summary["phases"]["evaluation"]["calls"] == 3
+    assert summary["counters"]["cache_hits"] + summary["counters"]["cache_misses"] == 3 * RUN["population_size"]
+    assert summary["memory"]["peak_bytes"] > 0
+    assert os.path.exists(str(tmp_path / "profile.prof"))
+
+    with open(metrics_path) as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 3
+    assert all(set(PROFILE_FIELDS) <= set(row) for row in rows)
+    assert sum(row["steps_simulated"] for row in rows) == summary["counters"]["steps_simulated"]
+    # every phase of a generation, breeding and checkpoints included, lands in its own row
+    for name in PROFILE_PHASES:
+        assert np.isclose(sum(row[f"{name}_phase_seconds"] for row in rows), summary["phases"][name]["seconds"])
+    assert all(row["selection_phase_seconds"] > 0 and row["checkpoint_phase_seconds"] > 0 for row in rows)
+
+def test_profile_columns_in_csv_metrics(tmp_path):
+    metrics_path = str(tmp_path / "metrics.csv")
+    evolve_patterns(profile=True, metrics_path=metrics_path, **RUN)
+    with open(metrics_path) as f:
+        header = f.readline().strip().split(",")
+    assert header[-len(PROFILE_FIELDS):] == PROFILE_FIELDS
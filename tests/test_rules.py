@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import (next_board_state, next_board_state_loop, next_cells_state, board_to_cells,
+                          cells_to_board, parse_rule, normalize_rule, compile_rule)
+from active_region import run_active_region
+from hashlife import hashlife_fitness
+from ga_solver import calculate_fitness, evaluate_population, evolve_patterns
+
+def rule_step_loop(board, births, survivals):
+    height, width = board.shape
+    new_board = np.zeros_like(board)
+    for y in range(height):
+        for x in range(width):
+            live_neighbors = sum(board[y + dy, x + dx]
+                                 for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                                 if (dy or dx) and 0 <= y + dy < height and 0 <= x + dx < width)
+            counts = survivals if board[y, x] == 1 else births
+            new_board[y, x] = int(live_neighbors in counts)
+    return new_board
+
+def test_parse_rule():
+    assert parse_rule("B3/S23") == ((3,), (2, 3))
+    assert parse_rule("s23/b36") == ((3, 6), (2, 3))
+    assert parse_rule("B2/S") == ((2,), ())
+    assert normalize_rule("S32/B63") == "B36/S23"
+    for invalid in ("B3", "23/3", "B39/S23", "B3/S23/S1", ""):
+        with pytest.raises(ValueError):
+            parse_rule(invalid)
+
+def test_compiled_table():
+    table = compile_rule("B36/S23").reshape(2, 9)
+    assert np.flatnonzero(table[0]).tolist() == [3, 6]
+    assert np.flatnonzero(table[1]).tolist() == [2, 3]
+
+def test_conway_rule_matches_loop():
+    rng = np.random.default_rng(15)
+    board = rng.integers(0, 2, size=(12, 17)).astype(int)
+    assert np.array_equal(next_board_state(board, rule="B3/S23"), next_board_state_loop(board))
+
+def test_rules_match_loop():
+    rng = np.random.default_rng(16)
+    for rule in ("B36/S23", "B2/S", "B0/S8", "B3678/S34678", "B1357/S1357"):
+        births, survivals = parse_rule(rule)
+        board = rng.integers(0, 2, size=(9, 11)).astype(int)
+        for _ in range(5):
+            expected = rule_step_loop(board, births, survivals)
+            board = next_board_state(board, rule=rule)
+            assert np.array_equal(board, expected)
+
+def test_highlife_replicator_on_the_infinite_plane():
+    replicator = np.array([[0, 0, 1, 1, 1],
+                           [0, 1, 0, 0, 1],
+                           [1, 0, 0, 0, 1],
+                           [1, 0, 0, 1, 0],
+                           [1, 1, 1, 0, 0]])
+    cells = board_to_cells(replicator)
+    large = np.zeros((80, 80), dtype=int)
+    large[38:43, 38:43] = replicator
+    for _ in range(12):
+        cells = next_cells_state(cells, "B36/S23")
+        large = next_board_state(large, rule="B36/S23")
+    board, (top, left) = cells_to_board(cells)
+    assert np.array_equal(board, large[top + 38:top + 38 + board.shape[0], left + 38:left + 38 + board.shape[1]])
+    with pytest.raises(ValueError):
+        next_cells_state(cells, "B0/S8")
+
+def test_engines_agree_on_other_rules():
+    rng = np.random.default_rng(17)
+    for _ in range(4):
+        board = rng.integers(0, 2, size=(10, 10)).astype(int)
+        fitness = calculate_fitness(board, 200, rule="B36/S23")
+        assert calculate_fitness(board, 200, "brent", rule="B36/S23") == fitness
+        assert hashlife_fitness(board, 200, rule="B36/S23") == fitness
+
+        expected = board
+        for _ in range(10):
+            expected = next_board_state(expected, rule="B2/S")
+        assert np.array_equal(run_active_region(board, 10, rule="B2/S"), expected)
+
+def test_population_fitness_uses_the_rule():
+    rng = np.random.default_rng(18)
+    population = [rng.integers(0, 2, size=(10, 10)).astype(int) for _ in range(6)]
+    fitnesses = evaluate_population(population, 100, rule="B36/S23")
+    assert fitnesses == [calculate_fitness(board, 100, rule="B36/S23") for board in population]
+
+def test_evolve_patterns_for_another_rule():
+    best_individual, history = evolve_patterns(population_size=8, num_generations=2, simulation_steps=30,
+                                               board_width=8, board_height=8, seed=4, rule="B36/S23",
+                                               num_workers=1, verbose=False)
+    assert len(history) == 2
+    assert max(history) == calculate_fitness(best_individual, 30, rule="B36/S23")
@@ -0,0 +1,44 @@
+import numpy as np
+import sys
+import os
+import io
+import contextlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import make_rng, spawn_rngs, random_state
+from ga_solver import create_initial_population, select_parents, evolve_patterns
+
+def _quiet_evolve(**kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return evolve_patterns(**kwargs)
+
+def test_same_seed_gives_same_boards():
+    assert np.array_equal(random_state(8, 6, make_rng(5)), random_state(8, 6, make_rng(5)))
+    population1 = create_initial_population(4, 5, 5, make_rng(6))
+    population2 = create_initial_population(4, 5, 5, make_rng(6))
+    assert all(np.array_equal(a, b) for a, b in zip(population1, population2))
+
+def test_child_streams_are_independent_and_reproducible():
+    children = spawn_rngs(make_rng(7), 3)
+    draws = [child.random(4) for child in children]
+    assert not np.allclose(draws[0], draws[1])
+    again = [child.random(4) for child in spawn_rngs(make_rng(7), 3)]
+    assert all(np.array_equal(a, b) for a, b in zip(draws, again))
+
+def test_select_parents_returns_tournament_winner():
+    population = [np.full((2, 2), index, dtype=int) for index in range(6)]
+    fitness = [3, 9, 1, 7, 5, 2]
+    winner = select_parents(population, fitness, len(population), make_rng(8))
+    assert np.array_equal(winner, population[1])
+
+def test_evolve_patterns_is_reproducible():
+    run_size = dict(population_size=20, num_generations=3, simulation_steps=200)
+    best1, history1 = _quiet_evolve(seed=11, **run_size)
+    best2, history2 = _quiet_evolve(seed=11, **run_size)
+    assert history1 == history2
+    assert np.array_equal(best1, best2)
+
+    best3, history3 = _quiet_evolve(seed=11, num_workers=2, **run_size)
+    assert history3 == history1
+    assert np.array_equal(best3, best1)
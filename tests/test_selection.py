@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+import sys
+import tracemalloc
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import make_rng
+from ga_solver import (_tournament_participants, select_tournament, select_rank, select_sus,
+                       breed_population, evolve_patterns, calculate_fitness)
+
+def test_tournament_participants_are_distinct():
+    rng = make_rng(22)
+    for population_size, tournament_size in [(10, 3), (10, 5), (10, 8), (200, 5), (6, 6), (200, 80), (200, 14)]:
+        participants = _tournament_participants(population_size, 500, tournament_size, rng)
+        assert participants.shape == (500, tournament_size)
+        assert participants.min() >= 0 and participants.max() < population_size
+        assert all(len(set(row)) == tournament_size for row in participants.tolist())
+
+def test_tournaments_just_above_sqrt_population_stay_small():
+    # t > sqrt(N) but far below N: repeats are common, yet no (T, N) buffer
+    population_size, num_tournaments, tournament_size = 10 ** 4, 10 ** 4 - 2, 101
+    tracemalloc.start()
+    try:
+        participants = _tournament_participants(population_size, num_tournaments, tournament_size, make_rng(3))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert participants.shape == (num_tournaments, tournament_size)
+    ordered = np.sort(participants, axis=1)
+    assert not (ordered[:, 1:] == ordered[:, :-1]).any()
+    assert participants.min() >= 0 and participants.max() < population_size
+    assert peak < num_tournaments * population_size
+
+def test_tournament_larger_than_population_is_rejected():
+    with pytest.raises(ValueError, match="Tournament size"):
+        _tournament_participants(10, 4, 11, make_rng(1))
+
+def test_tournament_winner_is_the_fittest_participant():
+    fitnesses = np.array([5, 9, 1, 8, 0, 3])
+    # a tournament over the whole population always returns the best
+    assert select_tournament(fitnesses, 4, 6, make_rng(1)).tolist() == [1, 1, 1, 1]
+    winners = select_tournament(fitnesses, 1000, 2, make_rng(2))
+    assert 4 not in winners
+    assert np.bincount(winners, minlength=6)[1] > np.bincount(winners, minlength=6)[5]
+
+def test_rank_selection_depends_only_on_rank():
+    rng = make_rng(23)
+    winners = select_rank(np.array([1000, 0, 2, 1]), 40000, 0, rng)
+    counts = np.bincount(winners, minlength=4) / 40000
+    # pressure 1.5 over 4 ranks: 0.5, 0.8333, 1.1667, 1.5 expected copies out of 4
+    assert np.allclose(counts, np.array([1.5, 0.5, 1.1667, 0.8333]) / 4, atol=0.01)
+    assert select_rank(np.array([7]), 3, 0, rng).tolist() == [0, 0, 0]
+
+def test_sus_counts_stay_close_to_expected():
+    fitnesses = np.array([10, 0, 30, 60])
+    winners = select_sus(fitnesses, 10, 0, make_rng(24))
+    counts = np.bincount(winners, minlength=4)
+    expected = fitnesses / fitnesses.sum() * 10
+    assert np.all(np.abs(counts - expected) < 1)
+    assert len(select_sus(np.zeros(5), 8, 0, make_rng(25))) == 8
+
+def test_breed_population_with_each_scheme():
+    population = make_rng(26).integers(0, 2, size=(9, 5, 5)).astype(np.uint8)
+    fitnesses = list(range(9))
+    for selection in ("tournament", "rank", "sus"):
+        out = breed_population(population, fitnesses, population[8], 9, 0.8, 0.05, 3, make_rng(27),
+                               selection=selection)
+        assert out.shape == (9, 5, 5)
+        assert np.array_equal(out[0], population[8])
+    with pytest.raises(ValueError):
+        breed_population(population, fitnesses, population[8], 9, 0.8, 0.05, 3, make_rng(27), selection="roulette")
+
+def test_evolve_with_rank_selection():
+    best, history = evolve_patterns(population_size=10, num_generations=3, simulation_steps=30, board_width=7,
+                                    board_height=7, selection="rank", seed=9, num_workers=1, verbose=False)
+    assert calculate_fitness(best, 30) == max(history)
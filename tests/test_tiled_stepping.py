@@ -0,0 +1,29 @@
+import numpy as np
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_of_life import next_board_state, next_board_state_tiled
+
+def test_tiled_matches_single_threaded_step():
+    rng = np.random.default_rng(81)
+    for shape in [(1, 5), (2, 2), (7, 3), (20, 20), (101, 37)]:
+        board = rng.integers(0, 2, size=shape).astype(int)
+        for num_threads in (1, 2, 3, 4, 8, 200):
+            assert np.array_equal(next_board_state_tiled(board, num_threads), next_board_state(board))
+
+def test_patterns_crossing_band_seams():
+    # a blinker standing across every seam of a 4-band split, and one on the bottom edge
+    board = np.zeros((16, 9), dtype=int)
+    for seam in (4, 8, 12):
+        board[seam - 1:seam + 2, 2] = 1
+    board[14:16, 6:8] = 1
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        tiled = board
+        expected = board
+        for _ in range(6):
+            tiled = next_board_state_tiled(tiled, 4, executor)
+            expected = next_board_state(expected)
+            assert np.array_equal(tiled, expected)